@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 from typing import List, Dict, Any
 from datetime import datetime
 from dataclasses import dataclass
@@ -11,11 +12,16 @@ class AlertSeverity(Enum):
     CRITICAL = "critical"
     EMERGENCY = "emergency"
 
+# Compact integer codes used by the active-alert severity index
+SEVERITY_CODES = {sev: code for code, sev in enumerate(AlertSeverity)}
+
 class AlertType(Enum):
     THRESHOLD = "threshold"
     TREND = "trend"
     HEALTH_DEGRADATION = "health_degradation"
 
+ALERT_CHECKS = tuple(t.value for t in AlertType)
+
 @dataclass
 class Alert:
     timestamp: datetime
@@ -29,6 +35,11 @@ class Alert:
     recommendations: Optional[List[str]] = None
     acknowledged: bool = False
 
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> List['Alert']:
+        """Build alerts from a list of field dicts."""
+        return [cls(**record) for record in records]
+
 class DABAlerting:
     """Simplified DAB Converter Alerting System"""
     
@@ -37,6 +48,8 @@ class DABAlerting:
         self.alerts: List[Alert] = []
         # Historical record (acknowledged + resolved alerts)
         self.alert_history: List[Alert] = []
+        # Severity code per active alert, kept aligned with self.alerts
+        self._active_severity = np.empty(0, dtype=np.int8)
         
         # Thresholds used by threshold checks
         self.thresholds = {
@@ -70,85 +83,105 @@ class DABAlerting:
         }
     
     
+    def _add_alert(self, alert: Alert) -> None:
+        """Store a new alert as active and in history, keeping the severity index in sync."""
+        self.alerts.append(alert)
+        self.alert_history.append(alert)
+        self._active_severity = np.append(self._active_severity, np.int8(SEVERITY_CODES[alert.severity]))
+
+    def check_all(self, df: pd.DataFrame, hours: int = 24, kinds: Optional[List[str]] = None) -> List[Alert]:
+        """Run the requested checks ('threshold', 'trend', 'health_degradation'; all by default)."""
+        kinds = ALERT_CHECKS if kinds is None else kinds
+        new_alerts: List[Alert] = []
+        if 'threshold' in kinds:
+            new_alerts += self.check_threshold_alerts(df)
+        if 'trend' in kinds:
+            # Health degradation alerts are a subset of the trend alerts
+            new_alerts += self.check_trend_alerts(df, hours)
+        elif 'health_degradation' in kinds:
+            new_alerts += self.check_health_degradation_alerts(df, hours)
+        return new_alerts
+
     def check_alerts(self, df: pd.DataFrame) -> List[Alert]:
         """Backward-compatible wrapper for threshold alerts."""
         return self.check_threshold_alerts(df)
 
     def check_threshold_alerts(self, df: pd.DataFrame) -> List[Alert]:
         """Check for basic threshold alerts and store them as active alerts."""
-        new_alerts: List[Alert] = []
         if df.empty:
-            return new_alerts
+            return []
         latest = df.iloc[-1]
-        for metric, thresholds in self.thresholds.items():
-            if metric in latest:
-                value = float(latest[metric])
-                severity = None
-                thr = None
-                if metric == 'efficiency_percent':
-                    if value <= thresholds['critical']:
-                        severity = AlertSeverity.CRITICAL
-                        thr = thresholds['critical']
-                    elif value <= thresholds['warning']:
-                        severity = AlertSeverity.WARNING
-                        thr = thresholds['warning']
-                else:
-                    if value >= thresholds['critical']:
-                        severity = AlertSeverity.CRITICAL
-                        thr = thresholds['critical']
-                    elif value >= thresholds['warning']:
-                        severity = AlertSeverity.WARNING
-                        thr = thresholds['warning']
-                if severity:
-                    alert = Alert(
-                        timestamp=latest.get('timestamp', datetime.now()),
-                        severity=severity,
-                        alert_type=AlertType.THRESHOLD,
-                        message=f"{metric.replace('_', ' ').title()}: {value:.2f} (threshold: {thr:.2f})",
-                        metric=metric,
-                        value=value,
-                        threshold=float(thr)
-                    )
-                    self.alerts.append(alert)
-                    self.alert_history.append(alert)
-                    new_alerts.append(alert)
+        metrics = [m for m in self.thresholds if m in latest]
+        if not metrics:
+            return []
+        values = latest[metrics].to_numpy(dtype=float)
+        warning = np.array([self.thresholds[m]['warning'] for m in metrics], dtype=float)
+        critical = np.array([self.thresholds[m]['critical'] for m in metrics], dtype=float)
+        # Flip low-is-bad metrics so "worse" is always the larger number
+        sign = np.array([-1.0 if m == 'efficiency_percent' else 1.0 for m in metrics])
+        is_critical = sign * values >= sign * critical
+        triggered = is_critical | (sign * values >= sign * warning)
+        thr = np.where(is_critical, critical, warning)
+        timestamp = latest.get('timestamp', datetime.now())
+        records = [
+            {
+                'timestamp': timestamp,
+                'severity': AlertSeverity.CRITICAL if is_critical[i] else AlertSeverity.WARNING,
+                'alert_type': AlertType.THRESHOLD,
+                'message': f"{metrics[i].replace('_', ' ').title()}: {values[i]:.2f} (threshold: {thr[i]:.2f})",
+                'metric': metrics[i],
+                'value': float(values[i]),
+                'threshold': float(thr[i])
+            }
+            for i in np.flatnonzero(triggered)
+        ]
+        new_alerts = Alert.from_records(records)
+        for alert in new_alerts:
+            self._add_alert(alert)
         return new_alerts
 
     def check_trend_alerts(self, df: pd.DataFrame, hours: int = 24) -> List[Alert]:
         """Raise alerts based on percent change trends over a time window."""
-        new_alerts: List[Alert] = []
         if df.empty or 'timestamp' not in df.columns:
-            return new_alerts
+            return []
         sdf = df.copy()
-        sdf['timestamp'] = pd.to_datetime(sdf['timestamp'], errors='coerce')
+        if not pd.api.types.is_datetime64_any_dtype(sdf['timestamp']):
+            sdf['timestamp'] = pd.to_datetime(sdf['timestamp'], errors='coerce')
         sdf = sdf.dropna(subset=['timestamp']).sort_values('timestamp')
         if len(sdf) < 2:
-            return new_alerts
+            return []
         cutoff = sdf['timestamp'].max() - pd.Timedelta(hours=hours)
         wdf = sdf[sdf['timestamp'] >= cutoff]
         if len(wdf) < 2:
-            return new_alerts
-        for metric, threshold in self.trend_thresholds.items():
-            if metric in wdf.columns and wdf[metric].notna().sum() >= 2:
-                start = float(wdf[metric].iloc[0])
-                end = float(wdf[metric].iloc[-1])
-                if start != 0:
-                    pct = ((end - start) / abs(start)) * 100.0
-                    trigger = (pct <= threshold) if threshold < 0 else (pct >= threshold)
-                    if trigger:
-                        severity = AlertSeverity.WARNING if abs(pct) < abs(threshold) * 2 else AlertSeverity.CRITICAL
-                        alert = Alert(
-                            timestamp=wdf['timestamp'].iloc[-1],
-                            severity=severity,
-                            alert_type=AlertType.TREND,
-                            message=f"{metric.replace('_',' ').title()} trend {pct:+.1f}% over {hours}h",
-                            metric=metric,
-                            value=end,
-                            trend_data={'start': start, 'end': end, 'pct_change': pct}
-                        )
-                        self.alerts.append(alert)
-                        self.alert_history.append(alert)
-                        new_alerts.append(alert)
+            return []
+        metrics = [m for m in self.trend_thresholds if m in wdf.columns]
+        if not metrics:
+            return []
+        window = wdf[metrics]
+        start = window.iloc[0].to_numpy(dtype=float)
+        end = window.iloc[-1].to_numpy(dtype=float)
+        threshold = np.array([self.trend_thresholds[m] for m in metrics], dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = ((end - start) / np.abs(start)) * 100.0
+        valid = (window.notna().sum().to_numpy() >= 2) & (start != 0)
+        triggered = valid & np.where(threshold < 0, pct <= threshold, pct >= threshold)
+        is_critical = np.abs(pct) >= np.abs(threshold) * 2
+        timestamp = wdf['timestamp'].iloc[-1]
+        records = [
+            {
+                'timestamp': timestamp,
+                'severity': AlertSeverity.CRITICAL if is_critical[i] else AlertSeverity.WARNING,
+                'alert_type': AlertType.TREND,
+                'message': f"{metrics[i].replace('_',' ').title()} trend {pct[i]:+.1f}% over {hours}h",
+                'metric': metrics[i],
+                'value': float(end[i]),
+                'trend_data': {'start': float(start[i]), 'end': float(end[i]), 'pct_change': float(pct[i])}
+            }
+            for i in np.flatnonzero(triggered)
+        ]
+        new_alerts = Alert.from_records(records)
+        for alert in new_alerts:
+            self._add_alert(alert)
         return new_alerts
 
     def check_health_degradation_alerts(self, df: pd.DataFrame, hours: int = 24) -> List[Alert]:
@@ -161,12 +194,20 @@ class DABAlerting:
         """Return current, unacknowledged alerts."""
         return [a for a in self.alerts if not a.acknowledged]
 
+    def get_active_alert_indices(self, severity: Optional[str] = None) -> np.ndarray:
+        """Indices into `alerts` of active alerts, optionally limited to one severity value."""
+        if severity is None:
+            return np.arange(len(self.alerts))
+        code = SEVERITY_CODES[AlertSeverity(severity)]
+        return np.flatnonzero(self._active_severity == code)
+
     def acknowledge_alert(self, index: int, user: str = "") -> None:
         """Acknowledge and remove an active alert by index."""
         if 0 <= index < len(self.alerts):
             self.alerts[index].acknowledged = True
             # Remove from active list while keeping in history
             self.alerts.pop(index)
+            self._active_severity = np.delete(self._active_severity, index)
 
     def get_alert_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Summarize alerts in the last window."""
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Any
 from datetime import datetime
+from backend.jit import njit
 
 def compute_health_score(row):
     """Calculate health score based on efficiency, temperature, and ZVS status"""
@@ -15,54 +16,73 @@ def add_health_scores(df):
     df['health_score'] = df.apply(compute_health_score, axis=1)
     return df
 
+# Threshold rules used by anomaly detection
+ANOMALY_THRESHOLDS = {
+    'efficiency_percent': {'warning': 95.0, 'critical': 90.0, 'direction': 'low'},
+    'temperature_C': {'warning': 60.0, 'critical': 70.0, 'direction': 'high'},
+    'health_score': {'warning': 80.0, 'critical': 60.0, 'direction': 'low'},
+}
+
+def _severity_codes(values, warning, critical, sign):
+    """0 = normal, 1 = warning, 2 = critical; `sign` is -1 where lower values are worse."""
+    v = sign * values
+    return np.where(v >= sign * critical, 2, np.where(v >= sign * warning, 1, 0)).astype(np.int8)
+
+def detect_anomalies_np(efficiency=None, temperature=None, health_score=None, timestamps=None) -> List[Dict[str, Any]]:
+    """Columnar detect_anomalies: one array per metric (None if absent), checked at the latest reading."""
+    columns = {'efficiency_percent': efficiency, 'temperature_C': temperature, 'health_score': health_score}
+    metrics = [m for m, col in columns.items() if col is not None and len(col)]
+    if not metrics:
+        return []
+    latest = [columns[m][-1] for m in metrics]
+    cfgs = [ANOMALY_THRESHOLDS[m] for m in metrics]
+    codes = _severity_codes(
+        np.array(latest, dtype=np.float64),
+        np.array([cfg['warning'] for cfg in cfgs], dtype=np.float64),
+        np.array([cfg['critical'] for cfg in cfgs], dtype=np.float64),
+        np.array([-1.0 if cfg['direction'] == 'low' else 1.0 for cfg in cfgs])
+    )
+    ts = timestamps[-1] if timestamps is not None and len(timestamps) else datetime.now()
+    
+    anomalies: List[Dict[str, Any]] = []
+    for metric, val, cfg, code in zip(metrics, latest, cfgs, codes):
+        if code:
+            severity = 'critical' if code == 2 else 'warning'
+            thr = cfg[severity]
+            anomalies.append({
+                'timestamp': pd.to_datetime(ts),
+                'metric': metric,
+                'value': float(val),
+                'threshold': float(thr),
+                'severity': severity,
+                'message': f"{metric.replace('_',' ').title()} {'low' if cfg['direction']=='low' else 'high'}: {val} (thr: {thr})"
+            })
+    return anomalies
+
 def detect_anomalies(df: pd.DataFrame) -> List[Dict[str, Any]]:
     """Detect basic anomalies in the data and include fields used by reports."""
-    anomalies: List[Dict[str, Any]] = []
-    
     if df.empty:
-        return anomalies
+        return []
     
-    latest = df.iloc[-1]
-    ts = latest['timestamp'] if 'timestamp' in latest else datetime.now()
-    
-    # Threshold rules
-    thresholds = {
-        'efficiency_percent': {'warning': 95.0, 'critical': 90.0, 'direction': 'low'},
-        'temperature_C': {'warning': 60.0, 'critical': 70.0, 'direction': 'high'},
-        'health_score': {'warning': 80.0, 'critical': 60.0, 'direction': 'low'},
-    }
+    def column(name):
+        return df[name].to_numpy() if name in df.columns else None
     
-    for metric, cfg in thresholds.items():
-        if metric in latest:
-            val = latest[metric]
-            severity = None
-            thr = None
-            if cfg['direction'] == 'low':
-                if val <= cfg['critical']:
-                    severity = 'critical'
-                    thr = cfg['critical']
-                elif val <= cfg['warning']:
-                    severity = 'warning'
-                    thr = cfg['warning']
-            else:  # high means higher is worse
-                if val >= cfg['critical']:
-                    severity = 'critical'
-                    thr = cfg['critical']
-                elif val >= cfg['warning']:
-                    severity = 'warning'
-                    thr = cfg['warning']
-            
-            if severity:
-                anomalies.append({
-                    'timestamp': pd.to_datetime(ts),
-                    'metric': metric,
-                    'value': float(val),
-                    'threshold': float(thr),
-                    'severity': severity,
-                    'message': f"{metric.replace('_',' ').title()} {'low' if cfg['direction']=='low' else 'high'}: {val} (thr: {thr})"
-                })
-    
-    return anomalies
+    return detect_anomalies_np(
+        column('efficiency_percent'), column('temperature_C'), column('health_score'), column('timestamp')
+    )
+
+ANOMALY_COLUMNS = ['timestamp', 'metric', 'value', 'threshold', 'severity', 'message']
+SEVERITY_DTYPE = pd.CategoricalDtype(['warning', 'critical'], ordered=True)
+
+def detect_anomalies_df(df: pd.DataFrame) -> pd.DataFrame:
+    """detect_anomalies as a typed table: datetime64 timestamp, float values, categorical severity."""
+    anomalies = detect_anomalies(df)
+    return pd.DataFrame({col: [a[col] for a in anomalies] for col in ANOMALY_COLUMNS}).astype({
+        'timestamp': 'datetime64[ns]',
+        'value': 'float64',
+        'threshold': 'float64',
+        'severity': SEVERITY_DTYPE
+    })
 
 def generate_basic_recommendations(df: pd.DataFrame) -> List[str]:
     """Generate simple recommendations based on current data"""
@@ -87,6 +107,19 @@ def generate_basic_recommendations(df: pd.DataFrame) -> List[str]:
     
     return recommendations
 
+@njit(cache=True)
+def _window_stats(vals):
+    """Return (first, last, nan-mean, non-NaN count) of a window of values."""
+    total = 0.0
+    count = 0
+    for i in range(vals.shape[0]):
+        v = vals[i]
+        if not np.isnan(v):
+            total += v
+            count += 1
+    mean = total / count if count > 0 else np.nan
+    return vals[0], vals[vals.shape[0] - 1], mean, count
+
 def analyze_trends(df: pd.DataFrame, hours: int = 24) -> Dict[str, Any]:
     """Analyze simple trends over a period and return percent changes per metric."""
     trends: Dict[str, Any] = {}
@@ -94,31 +127,35 @@ def analyze_trends(df: pd.DataFrame, hours: int = 24) -> Dict[str, Any]:
         return trends
     
     df = df.copy()
-    df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+    if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
     df = df.dropna(subset=['timestamp']).sort_values('timestamp')
     if df.empty:
         return trends
     
-    cutoff = df['timestamp'].max() - pd.Timedelta(hours=hours)
-    window_df = df[df['timestamp'] >= cutoff]
-    if len(window_df) < 2:
+    # Window start: first timestamp >= max - hours (timestamps are sorted)
+    ts_ns = df['timestamp'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    first = int(np.searchsorted(ts_ns, ts_ns[-1] - pd.Timedelta(hours=hours).value, side='left'))
+    if len(ts_ns) - first < 2:
         return trends
     
     metrics = ['efficiency_percent', 'temperature_C', 'health_score']
     for metric in metrics:
-        if metric in window_df.columns and window_df[metric].notna().sum() >= 2:
-            start_val = window_df[metric].iloc[0]
-            end_val = window_df[metric].iloc[-1]
-            if pd.notna(start_val) and start_val != 0 and pd.notna(end_val):
+        if metric in df.columns:
+            vals = df[metric].to_numpy()[first:]
+            if vals.dtype.kind != 'f':
+                vals = vals.astype(np.float64)
+            # float32 inputs are kept as-is; the kernel accumulates in float64
+            vals = np.ascontiguousarray(vals)
+            start_val, end_val, avg_val, count = _window_stats(vals)
+            if count >= 2 and not np.isnan(start_val) and start_val != 0 and not np.isnan(end_val):
                 pct_change = ((end_val - start_val) / abs(start_val)) * 100.0
-                avg_val = window_df[metric].mean()
                 trends[metric] = {
                     'start': float(start_val),
                     'end': float(end_val),
                     'current': float(end_val),
-                    'average': float(avg_val) if pd.notna(avg_val) else float('nan'),
+                    'average': float(avg_val),
                     'pct_change': float(pct_change),
                     'trend': 'increasing' if pct_change > 0 else 'decreasing' if pct_change < 0 else 'stable'
                 }
     return trends
-
@@ -16,39 +16,43 @@ class DABRecommendations:
     
     
     def generate_recommendations(self, df: pd.DataFrame) -> List[str]:
-        """Generate simple recommendations based on current data"""
-        recommendations = []
-        
+        """Generate simple recommendations based on current data, critical ones first"""
         if df.empty:
-            return recommendations
+            return []
         
-        latest = df.iloc[-1]
+        return self.generate_recommendations_scalar(df.iloc[-1])
+    
+    def generate_recommendations_scalar(self, latest: Dict[str, Any]) -> List[str]:
+        """Same as generate_recommendations for a single reading (dict or row Series)"""
+        # Collected per level so the result comes back already sorted by priority
+        critical: List[str] = []
+        warning: List[str] = []
         
         # Efficiency recommendations
         if 'efficiency_percent' in latest:
             efficiency = latest['efficiency_percent']
             if efficiency < self.thresholds['efficiency_percent']['critical']:
-                recommendations.append("Critical: Increase phase shift to improve efficiency")
+                critical.append("Critical: Increase phase shift to improve efficiency")
             elif efficiency < self.thresholds['efficiency_percent']['warning']:
-                recommendations.append("Warning: Consider optimizing phase shift for better efficiency")
+                warning.append("Warning: Consider optimizing phase shift for better efficiency")
         
         # Temperature recommendations
         if 'temperature_C' in latest:
             temperature = latest['temperature_C']
             if temperature > self.thresholds['temperature_C']['critical']:
-                recommendations.append("Critical: Reduce load power to lower temperature")
+                critical.append("Critical: Reduce load power to lower temperature")
             elif temperature > self.thresholds['temperature_C']['warning']:
-                recommendations.append("Warning: Monitor temperature and consider cooling improvements")
+                warning.append("Warning: Monitor temperature and consider cooling improvements")
         
         # Health score recommendations
         if 'health_score' in latest:
             health_score = latest['health_score']
             if health_score < self.thresholds['health_score']['critical']:
-                recommendations.append("Critical: Perform maintenance on power components")
+                critical.append("Critical: Perform maintenance on power components")
             elif health_score < self.thresholds['health_score']['warning']:
-                recommendations.append("Warning: Schedule preventive maintenance")
+                warning.append("Warning: Schedule preventive maintenance")
         
-        return recommendations
+        return critical + warning
     
     def get_parameter_optimization(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Return simple parameter optimization suggestions for phi and duty cycles.
@@ -18,10 +18,11 @@ def create_health_report(df, report_type='weekly', output_path=None):
     Args:
         df: DataFrame with DAB data
         report_type: 'weekly' or 'monthly'
-        output_path: Path to save the PDF (if None, returns bytes)
+        output_path: Path or binary file-like object (e.g. io.BytesIO) to
+            write the PDF to (if None, returns bytes)
     
     Returns:
-        PDF bytes if output_path is None
+        PDF bytes if output_path is None, otherwise output_path
     """
     # Add health scores and detect anomalies
     df = add_health_scores(df)
@@ -42,7 +43,7 @@ def create_health_report(df, report_type='weekly', output_path=None):
     plots = create_report_plots(df_filtered, anomalies)
     
     # Generate PDF
-    if output_path:
+    if output_path is not None:
         doc = SimpleDocTemplate(output_path, pagesize=A4)
     else:
         buffer = io.BytesIO()
@@ -137,7 +138,7 @@ def create_health_report(df, report_type='weekly', output_path=None):
     # Build PDF
     doc.build(story)
     
-    if output_path:
+    if output_path is not None:
         return output_path
     else:
         buffer.seek(0)
@@ -22,8 +22,22 @@ def load_sheets_data():
     # Ensure boolean
     if 'ZVS_status' in df.columns:
         df['ZVS_status'] = df['ZVS_status'].apply(lambda x: str(x).lower() in ['true', '1'])
+    # Parse timestamps once here so pages don't re-parse on every rerun
+    if 'timestamp' in df.columns:
+        df['timestamp'] = parse_timestamps(df['timestamp'])
     return df
 
+def parse_timestamps(col):
+    """Parse a timestamp column on pandas' ISO8601 fast path, falling back per cell."""
+    if pd.api.types.is_numeric_dtype(col):
+        return pd.to_datetime(col, unit='s', errors='coerce')
+    parsed = pd.to_datetime(col, format='ISO8601', errors='coerce', cache=True)
+    # Sheets can hand back locale-formatted cells; only those take the slow parser
+    missed = parsed.isna() & col.notna() & (col.astype(str) != '')
+    if missed.any():
+        parsed[missed] = pd.to_datetime(col[missed], errors='coerce')
+    return parsed
+
 
 def append_row_to_sheet(row):
     client = get_gspread_client()
@@ -1,6 +1,33 @@
 import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Dict, List
+from backend.jit import njit
+
+@njit(cache=True)
+def _sim_kernel(Vdc1, phi, delta1, delta2, Pload, R_on):
+    """Efficiency (%), temperature (°C) and ZVS for one parameter set."""
+    # Simplified loss calculation, plus 2% for other losses
+    I_transformer = Pload / (Vdc1 * delta1)
+    P_conduction = I_transformer**2 * R_on * (delta1 + delta2)
+    P_total_loss = P_conduction + 0.02 * Pload
+    efficiency = max(0.0, min(100.0, (Pload / (Pload + P_total_loss)) * 100))
+    # 25°C ambient + 0.5°C/W thermal resistance
+    temperature = 25.0 + Pload * (1 - efficiency / 100) * 0.5
+    zvs = (phi > 0.1) and (I_transformer > 0.3)
+    return efficiency, temperature, zvs
+
+@njit(cache=True)
+def _simulate_batch(Vdc1, phi, delta1, delta2, Pload, R_on):
+    """_sim_kernel over N parameter sets (serial: called concurrently from session threads)."""
+    n = Pload.shape[0]
+    efficiency = np.empty(n)
+    temperature = np.empty(n)
+    zvs = np.empty(n, dtype=np.bool_)
+    for i in range(n):
+        efficiency[i], temperature[i], zvs[i] = _sim_kernel(
+            Vdc1[i], phi[i], delta1[i], delta2[i], Pload[i], R_on[i]
+        )
+    return efficiency, temperature, zvs
 
 class DABSimulator:
     """Simplified DAB Converter Simulator"""
@@ -20,51 +47,53 @@ class DABSimulator:
             'C_oss': 100e-12,   # Output capacitance (F)
         }
     
+    def _kernel(self, params: Dict[str, float]):
+        return _sim_kernel(
+            float(params['Vdc1']), float(params['phi']), float(params['delta1']),
+            float(params['delta2']), float(params['Pload']), float(params['R_on'])
+        )
+    
     def simulate_efficiency(self, params: Dict[str, float]) -> float:
         """Calculate efficiency based on parameters"""
-        Pload = params['Pload']
-        delta1, delta2 = params['delta1'], params['delta2']
-        Vdc1 = params['Vdc1']
-        R_on = params['R_on']
-        
-        # Simplified loss calculation
-        I_transformer = Pload / (Vdc1 * delta1)
-        P_conduction = I_transformer**2 * R_on * (delta1 + delta2)
-        P_total_loss = P_conduction + 0.02 * Pload  # Add 2% for other losses
-        
-        efficiency = (Pload / (Pload + P_total_loss)) * 100
-        return max(0, min(100, efficiency))
+        return float(self._kernel(params)[0])
     
     def simulate_temperature(self, params: Dict[str, float]) -> float:
         """Calculate temperature based on power dissipation"""
-        efficiency = self.simulate_efficiency(params)
-        Pload = params['Pload']
-        
-        # Simple temperature calculation
-        P_dissipated = Pload * (1 - efficiency/100)
-        return 25.0 + P_dissipated * 0.5  # 25°C ambient + 0.5°C/W thermal resistance
+        return float(self._kernel(params)[1])
     
     def check_zvs_status(self, params: Dict[str, float]) -> bool:
         """Check if ZVS operation is achieved"""
-        phi = params['phi']
-        Pload = params['Pload']
-        Vdc1 = params['Vdc1']
-        delta1 = params['delta1']
-        
-        # Simplified ZVS check
-        I_transformer = Pload / (Vdc1 * delta1)
-        return (phi > 0.1) and (I_transformer > 0.3)
+        return bool(self._kernel(params)[2])
     
     
     def run_simulation(self, params: Dict[str, float]) -> Dict[str, float]:
         """Run basic simulation with given parameters"""
-        efficiency = self.simulate_efficiency(params)
-        temperature = self.simulate_temperature(params)
-        zvs_status = self.check_zvs_status(params)
+        efficiency, temperature, zvs_status = self._kernel(params)
         
         return {
-            'efficiency': efficiency,
-            'temperature': temperature,
-            'zvs_status': zvs_status
+            'efficiency': float(efficiency),
+            'temperature': float(temperature),
+            'zvs_status': bool(zvs_status)
         }
     
+    def run_simulation_batch(self, params: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Array form of run_simulation: one entry per run, scalars broadcast across runs"""
+        keys = ('Vdc1', 'phi', 'delta1', 'delta2', 'Pload', 'R_on')
+        arrays = np.broadcast_arrays(*(np.asarray(params[key], dtype=np.float64) for key in keys))
+        efficiency, temperature, zvs = _simulate_batch(
+            *(np.ascontiguousarray(a).ravel() for a in arrays)
+        )
+        return {'efficiency': efficiency, 'temperature': temperature, 'zvs_status': zvs}
+    
+    def run_batch(self, params_list: List[Dict[str, float]]) -> List[Dict[str, float]]:
+        """Run several parameter sets in one compiled call; results match run_simulation."""
+        cols = {
+            key: np.array([float(p[key]) for p in params_list], dtype=np.float64)
+            for key in ('Vdc1', 'phi', 'delta1', 'delta2', 'Pload', 'R_on')
+        }
+        out = self.run_simulation_batch(cols)
+        efficiency, temperature, zvs = out['efficiency'], out['temperature'], out['zvs_status']
+        return [
+            {'efficiency': float(e), 'temperature': float(t), 'zvs_status': bool(z)}
+            for e, t, z in zip(efficiency, temperature, zvs)
+        ]
@@ -0,0 +1,64 @@
+"""Profile the Recommendations panel under Streamlit's AppTest.
+
+Runs recommendations_panel.show() twice per section (first visit, then a
+rerun that should hit the st.cache_data entries) inside cProfile and writes
+one .prof file per run. Inspect them with `snakeviz <file>.prof` or pstats.
+
+Usage (from the repo root; needs the Google Sheets credentials):
+    python -m frontend._perf_harness --out-dir prof --top 25
+"""
+import argparse
+import os
+import pstats
+import sys
+
+from streamlit.testing.v1 import AppTest
+
+from frontend.recommendations_panel import PANEL_SECTIONS
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _profiled_page():
+    # AppTest.from_function runs this body as a standalone script, so all
+    # inputs come from the environment rather than closures.
+    import cProfile
+    import os
+    import sys
+    sys.path.insert(0, os.environ['PERF_REPO_ROOT'])
+    from frontend import recommendations_panel
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    recommendations_panel.show()
+    profiler.disable()
+    profiler.dump_stats(os.environ['PERF_PROF_OUT'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out-dir', default='prof', help="Directory for the .prof files")
+    parser.add_argument('--top', type=int, default=25, help="Functions to print per run")
+    parser.add_argument('--timeout', type=float, default=120, help="Seconds allowed per script run")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    os.environ['PERF_REPO_ROOT'] = REPO_ROOT
+    at = AppTest.from_function(_profiled_page, default_timeout=args.timeout)
+
+    for section in PANEL_SECTIONS:
+        for run in ('first', 'rerun'):
+            out = os.path.join(args.out_dir, f"recommendations_{section.replace(' ', '_').lower()}_{run}.prof")
+            os.environ['PERF_PROF_OUT'] = out
+            if at.radio:
+                at.radio[0].set_value(section)
+            at.run()
+            if at.exception:
+                print(f"{section} ({run}) raised: {at.exception[0].message}", file=sys.stderr)
+                continue
+            print(f"\n=== {section} ({run}) -> {out}")
+            pstats.Stats(out).sort_stats('cumulative').print_stats(args.top)
+
+
+if __name__ == '__main__':
+    main()
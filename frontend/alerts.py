@@ -10,6 +10,55 @@ from backend.sheets_loader import load_sheets_data
 from backend.alerting import DABAlerting, AlertSeverity, AlertType
 from backend.diagnostics import add_health_scores
 
+# Color code by severity
+SEVERITY_EMOJI = {
+    AlertSeverity.INFO: "🟢",
+    AlertSeverity.WARNING: "🟡",
+    AlertSeverity.CRITICAL: "🟠",
+    AlertSeverity.EMERGENCY: "🔴"
+}
+SEVERITY_LABELS = {sev: sev.value.upper() for sev in AlertSeverity}
+
+def _history_key(alerting, cutoff, severity, alert_type):
+    """Cheap key that changes whenever alert history, acknowledgements or filters change."""
+    history = alerting.alert_history
+    last_ts = history[-1].timestamp if history else None
+    return (len(history), last_ts, len(alerting.alerts), cutoff, severity, alert_type)
+
+def build_history_df(alerting, cutoff, severity, alert_type):
+    """Build the alert history table, reusing the last one while the key is unchanged."""
+    # Memoized per session in a single slot: a global st.cache_data would keep one
+    # entry per cutoff minute and per session, and never evict them
+    key = _history_key(alerting, cutoff, severity, alert_type)
+    cached = st.session_state.get('alert_history_view')
+    if cached is None or cached['key'] != key:
+        rows = [
+            a for a in alerting.alert_history
+            if a.timestamp > cutoff
+            and (severity == "All" or a.severity.value == severity)
+            and (alert_type == "All" or a.alert_type.value == alert_type)
+        ]
+        df = pd.DataFrame({
+            'Timestamp': [a.timestamp.strftime('%Y-%m-%d %H:%M:%S') for a in rows],
+            'Severity': [a.severity.value.upper() for a in rows],
+            'Type': [a.alert_type.value for a in rows],
+            'Metric': [a.metric for a in rows],
+            'Value': [f"{a.value:.2f}" for a in rows],
+            'Message': [a.message[:50] + "..." if len(a.message) > 50 else a.message for a in rows],
+            'Acknowledged': ["✅" if a.acknowledged else "❌" for a in rows]
+        })
+        cached = {'key': key, 'df': df, 'csv': None}
+        st.session_state.alert_history_view = cached
+    return cached['df']
+
+def history_csv(alerting, cutoff, severity, alert_type):
+    """CSV export of the alert history, serialized once per history state and filter set."""
+    df = build_history_df(alerting, cutoff, severity, alert_type)
+    cached = st.session_state.alert_history_view
+    if cached['csv'] is None:
+        cached['csv'] = df.to_csv(index=False).encode()
+    return cached['csv']
+
 def show():
     st.title("🚨 DAB HealthAI — Alerting System")
     st.write("Monitor system health with real-time alerts and notifications.")
@@ -24,7 +73,6 @@ def show():
     df = load_sheets_data()
     if not df.empty:
         df = add_health_scores(df)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
     
     # Sidebar for configuration
     st.sidebar.header("Alert Configuration")
@@ -153,7 +201,7 @@ def show():
         with col1:
             if st.button("🔍 Check Threshold Alerts"):
                 with st.spinner("Checking for threshold alerts..."):
-                    new_alerts = alerting.check_threshold_alerts(df)
+                    new_alerts = alerting.check_all(df, kinds=['threshold'])
                     if new_alerts:
                         st.success(f"✅ {len(new_alerts)} new threshold alerts detected!")
                     else:
@@ -162,7 +210,7 @@ def show():
         with col2:
             if st.button("📈 Check Trend Alerts"):
                 with st.spinner("Checking for trend alerts..."):
-                    new_alerts = alerting.check_trend_alerts(df, hours=24)
+                    new_alerts = alerting.check_all(df, hours=24, kinds=['trend'])
                     if new_alerts:
                         st.success(f"✅ {len(new_alerts)} new trend alerts detected!")
                     else:
@@ -171,7 +219,7 @@ def show():
         with col3:
             if st.button("💔 Check Health Degradation"):
                 with st.spinner("Checking for health degradation..."):
-                    new_alerts = alerting.check_health_degradation_alerts(df, hours=24)
+                    new_alerts = alerting.check_all(df, hours=24, kinds=['health_degradation'])
                     if new_alerts:
                         st.success(f"✅ {len(new_alerts)} new health degradation alerts detected!")
                     else:
@@ -180,9 +228,7 @@ def show():
     # Active alerts
     st.subheader("Active Alerts")
     
-    active_alerts = alerting.get_active_alerts()
-    
-    if active_alerts:
+    if alerting.alerts:
         # Filter by severity
         severity_filter = st.selectbox(
             "Filter by Severity",
@@ -190,22 +236,15 @@ def show():
             index=0
         )
         
-        if severity_filter == "All":
-            filtered_alerts = active_alerts
-        else:
-            filtered_alerts = [a for a in active_alerts if a.severity.value == severity_filter]
+        # Positions in alerting.alerts, so acknowledging a filtered alert hits the right one
+        alert_indices = alerting.get_active_alert_indices(
+            None if severity_filter == "All" else severity_filter
+        )
         
         # Display alerts
-        for i, alert in enumerate(filtered_alerts):
-            # Color code by severity
-            severity_colors = {
-                AlertSeverity.INFO: "🟢",
-                AlertSeverity.WARNING: "🟡",
-                AlertSeverity.CRITICAL: "🟠",
-                AlertSeverity.EMERGENCY: "🔴"
-            }
-            
-            with st.expander(f"{severity_colors[alert.severity]} {alert.severity.value.upper()}: {alert.message}"):
+        for i in alert_indices:
+            alert = alerting.alerts[i]
+            with st.expander(f"{SEVERITY_EMOJI[alert.severity]} {SEVERITY_LABELS[alert.severity]}: {alert.message}"):
                 col1, col2 = st.columns(2)
                 
                 with col1:
@@ -232,7 +271,7 @@ def show():
                 
                 # Acknowledge button
                 if st.button(f"Acknowledge Alert {i}", key=f"ack_{i}"):
-                    alerting.acknowledge_alert(i, "User")
+                    alerting.acknowledge_alert(int(i), "User")
                     st.success("Alert acknowledged!")
                     st.rerun()
     
@@ -317,41 +356,19 @@ def show():
         )
     
     # Get filtered history
-    cutoff_time = datetime.now() - timedelta(hours=history_hours)
-    filtered_history = [a for a in alerting.alert_history if a.timestamp > cutoff_time]
-    
-    if history_severity != "All":
-        filtered_history = [a for a in filtered_history if a.severity.value == history_severity]
-    
-    if history_type != "All":
-        filtered_history = [a for a in filtered_history if a.alert_type.value == history_type]
-    
-    if filtered_history:
-        # Convert to DataFrame for display
-        history_data = []
-        for alert in filtered_history:
-            history_data.append({
-                'Timestamp': alert.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-                'Severity': alert.severity.value.upper(),
-                'Type': alert.alert_type.value,
-                'Metric': alert.metric,
-                'Value': f"{alert.value:.2f}",
-                'Message': alert.message[:50] + "..." if len(alert.message) > 50 else alert.message,
-                'Acknowledged': "✅" if alert.acknowledged else "❌"
-            })
-        
-        history_df = pd.DataFrame(history_data)
+    cutoff_time = (datetime.now() - timedelta(hours=history_hours)).replace(second=0, microsecond=0)
+    history_df = build_history_df(alerting, cutoff_time, history_severity, history_type)
+    
+    if not history_df.empty:
         st.dataframe(history_df, use_container_width=True)
         
         # Export option
-        if st.button("📊 Export Alert History"):
-            csv = history_df.to_csv(index=False)
-            st.download_button(
-                label="📥 Download CSV",
-                data=csv,
-                file_name=f"alert_history_{history_hours}h.csv",
-                mime="text/csv"
-            )
+        st.download_button(
+            label="📥 Download CSV",
+            data=history_csv(alerting, cutoff_time, history_severity, history_type),
+            file_name=f"alert_history_{history_hours}h.csv",
+            mime="text/csv"
+        )
     else:
         st.info("No alerts found for the selected filters.")
     
@@ -5,29 +5,124 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from backend.sheets_loader import load_sheets_data
 from backend.diagnostics import add_health_scores
 
-import google.generativeai as genai
-from sentence_transformers import SentenceTransformer, util
 import json
-from dotenv import load_dotenv
+import logging
+import shutil
+import tempfile
+import numpy as np
+
+# google.generativeai and sentence_transformers pull in torch/transformers,
+# so they are imported on first use rather than when the page module loads.
+_genai = None
 
 # ---------- Load Gemini API Key ----------
-load_dotenv()
-api_key = os.getenv("GOOGLE_API_KEY")
-if api_key:
-    genai.configure(api_key=api_key)
-else:
-    raise ValueError("GOOGLE_API_KEY not found in .env")
+def get_genai():
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+        from dotenv import load_dotenv
+        load_dotenv()
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError("GOOGLE_API_KEY not found in .env")
+        genai.configure(api_key=api_key)
+        _genai = genai
+    return _genai
 
 # ---------- Helper: Generate Gemini Response ----------
 def generate_gemini_response(prompt, model_name="gemini-2.0-flash"):
-    model = genai.GenerativeModel(model_name)
+    model = get_genai().GenerativeModel(model_name)
     response = model.generate_content(prompt)
     return response.text
 
+# ---------- ONNX Embedding Encoder ----------
+ONNX_MODEL_ID = 'sentence-transformers/all-MiniLM-L6-v2'
+# Per-user cache; each export lives in a subdirectory named by model id and optimum version
+ONNX_CACHE_ROOT = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+    'powerpulse', 'onnx'
+)
+
+class OnnxSentenceEncoder:
+    """Int8 ONNX Runtime version of all-MiniLM-L6-v2 exposing SentenceTransformer's `.encode`."""
+
+    def __init__(self, model, tokenizer, max_length=256):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+
+    def encode(self, sentences, convert_to_tensor=False, batch_size=32):
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        batches = []
+        for i in range(0, len(sentences), batch_size):
+            # NumPy inputs keep ONNX Runtime (and its outputs) off torch entirely
+            inputs = dict(self.tokenizer(sentences[i:i+batch_size], padding=True, truncation=True,
+                                         max_length=self.max_length, return_tensors='np'))
+            token_embeddings = np.asarray(self.model(**inputs).last_hidden_state)
+            # Mean pooling + L2 normalisation, same as the SentenceTransformer pipeline
+            mask = inputs['attention_mask'][..., None].astype(token_embeddings.dtype)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+            batches.append(pooled / np.clip(norms, 1e-12, None))
+        embeddings = np.concatenate(batches)
+        if single:
+            embeddings = embeddings[0]
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(embeddings)
+        return embeddings
+
+def load_onnx_encoder():
+    """Export MiniLM to ONNX once, quantize it to int8 and load it on the CPU provider."""
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    from optimum.version import __version__ as optimum_version
+
+    quantized_file = 'model_quantized.onnx'
+    cache_dir = os.path.join(
+        ONNX_CACHE_ROOT, f"{ONNX_MODEL_ID.replace('/', '--')}-int8-optimum{optimum_version}"
+    )
+    if not os.path.isdir(cache_dir):
+        os.makedirs(ONNX_CACHE_ROOT, mode=0o700, exist_ok=True)
+        # Build in a private scratch directory and rename it into place, so a
+        # half-written export is never picked up by this or a concurrent process
+        build_dir = tempfile.mkdtemp(dir=ONNX_CACHE_ROOT)
+        try:
+            model = ORTModelForFeatureExtraction.from_pretrained(ONNX_MODEL_ID, export=True)
+            model.save_pretrained(build_dir)
+            quantizer = ORTQuantizer.from_pretrained(model)
+            qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=build_dir, quantization_config=qconfig)
+            os.rename(build_dir, cache_dir)
+        except OSError:
+            # Another process finished the same export first
+            if not os.path.isdir(cache_dir):
+                raise
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+    model = ORTModelForFeatureExtraction.from_pretrained(
+        cache_dir, file_name=quantized_file, provider='CPUExecutionProvider'
+    )
+    tokenizer = AutoTokenizer.from_pretrained(ONNX_MODEL_ID)
+    return OnnxSentenceEncoder(model, tokenizer)
+
 # ---------- Cache Embedding Model ----------
 @st.cache_resource
 def load_embedding_model():
-    return SentenceTransformer('all-MiniLM-L6-v2', device='cpu')
+    try:
+        return load_onnx_encoder()
+    except Exception:
+        # optimum/onnxruntime missing, or the first-run export/quantization failed
+        # (network, runtime or disk errors): fall back to the PyTorch model
+        logging.getLogger(__name__).warning(
+            "ONNX embedding encoder unavailable; using SentenceTransformer", exc_info=True
+        )
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer('all-MiniLM-L6-v2', device='cpu')
 
 # ---------- Chunk DataFrame ----------
 def chunk_dataframe(df, chunk_size=200):
@@ -41,10 +136,13 @@ def get_most_relevant_chunks(df_chunks, query, model, top_k=2):
         chunk = chunk.applymap(lambda x: str(x) if pd.isna(x) or isinstance(x, pd.Timestamp) else x)
         json_str = json.dumps(chunk.to_dict(orient="records"), indent=2)
         json_chunks.append(json_str)
-    query_embedding = model.encode(query, convert_to_tensor=True)
-    chunk_embeddings = model.encode(json_chunks, convert_to_tensor=True)
-    scores = util.cos_sim(query_embedding, chunk_embeddings)[0]
-    top_indices = scores.argsort(descending=True)[:top_k]
+    query_embedding = np.asarray(model.encode(query))
+    chunk_embeddings = np.asarray(model.encode(json_chunks))
+    # Cosine similarity on normalised vectors; works for both the ONNX and PyTorch encoders
+    query_embedding = query_embedding / np.linalg.norm(query_embedding)
+    chunk_embeddings = chunk_embeddings / np.linalg.norm(chunk_embeddings, axis=1, keepdims=True)
+    scores = chunk_embeddings @ query_embedding
+    top_indices = np.argsort(-scores, kind='stable')[:top_k]
     return [json_chunks[i] for i in top_indices]
 
 # ---------- Main Chatbot UI ----------
@@ -10,7 +10,6 @@ def show():
     st.title("📈 DAB HealthAI — Analytics Dashboard")
     df = load_sheets_data()
     df = add_health_scores(df)
-    df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
 
     # Date range filter
     min_date, max_date = df['timestamp'].min(), df['timestamp'].max()
@@ -6,367 +6,441 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import sys
 import os
+import io
+import csv
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from backend.sheets_loader import load_sheets_data
 from backend.recommendations import DABRecommendations
-from backend.diagnostics import add_health_scores, analyze_trends, detect_anomalies
+from backend.diagnostics import add_health_scores, analyze_trends
 from backend.simulator import DABSimulator
 
+PERFORMANCE_COLUMNS = ('timestamp', 'efficiency_percent', 'temperature_C', 'health_score', 'ZVS_status')
+
+FLOAT32_COLUMNS = ['efficiency_percent', 'temperature_C', 'health_score', 'phi', 'delta1', 'delta2',
+                   'fsw', 'Pload', 'Vdc1', 'Vdc2']
+
+# Columns read from the latest row, with fallbacks for sheets that lack them
+LATEST_DEFAULTS = (
+    ('phi', 0.3), ('fsw', 100000), ('delta1', 0.5), ('delta2', 0.5),
+    ('efficiency_percent', 0), ('temperature_C', 0), ('health_score', 0),
+    ('ZVS_status', False), ('Vdc1', 400.0), ('Vdc2', 48.0), ('Pload', 1000.0),
+)
+
+# ZVS restoration strategies: (strategy, description, impact, effort, risk, value_fn).
+# value_fn maps the latest values to (current, suggested) display strings.
+ZVS_STRATEGIES = (
+    ('Increase Phase Shift (φ)',
+     'Gradually increase phase shift to restore ZVS conditions',
+     'Restore ZVS operation, reduce switching losses', 'Low', 'Low',
+     lambda v: (f"{v['phi']:.3f}", f"{min(np.pi/2, v['phi'] + 0.05):.3f}")),
+    ('Optimize Duty Cycles',
+     'Balance duty cycles for optimal transformer current',
+     'Improve current balance, enhance ZVS margin', 'Low', 'Low',
+     lambda v: (f"δ₁: {v['delta1']:.2f}, δ₂: {v['delta2']:.2f}", "δ₁: 0.50, δ₂: 0.50")),
+    ('Reduce Switching Frequency',
+     'Lower switching frequency to improve ZVS margin',
+     'Increase ZVS margin, reduce switching losses', 'Medium', 'Medium',
+     lambda v: (f"{v['fsw']/1000:.0f} kHz", f"{v['fsw']*0.9/1000:.0f} kHz")),
+)
+
+# Markdown templates for the optimization expanders, one st.markdown call per block
+PHI_SUGGESTION_MD = "\n\n".join([
+    "**Current Value:** {current:.3f}",
+    "**Suggested Value:** {suggested:.3f}",
+    "**Reason:** {reason}",
+    "**Expected Impact:** {expected_impact}",
+])
+DUTY_SUGGESTION_MD = "\n\n".join([
+    "**Current Values:**",
+    "• δ₁: {current[delta1]:.2f}",
+    "• δ₂: {current[delta2]:.2f}",
+    "**Suggested Values:**",
+    "• δ₁: {suggested[delta1]:.2f}",
+    "• δ₂: {suggested[delta2]:.2f}",
+    "**Reason:** {reason}",
+    "**Expected Impact:** {expected_impact}",
+])
+SIM_RESULT_MD = "\n\n".join([
+    "**{label} Parameters:**",
+    "• Efficiency: {efficiency:.2f}%",
+    "• Temperature: {temperature:.1f}°C",
+    "• ZVS: {zvs}",
+])
+
+PANEL_SECTIONS = ["Status", "Recommendations", "Trends", "Perf Monitor", "Tracking"]
+
+# (action, priority, impact) for metrics degrading more than 5% over the window
+TREND_RULES = {
+    'efficiency_percent': ('Investigate efficiency degradation trend', 'medium',
+                           'Identify root cause of performance decline'),
+    'temperature_C': ('Monitor temperature trend and check cooling system', 'medium',
+                      'Prevent thermal runaway and component damage'),
+    'health_score': ('Perform preventive maintenance on power components', 'high',
+                     'Prevent further degradation and potential failures'),
+}
+
+def _df_fingerprint(df):
+    """Cheap cache key for a sheet snapshot: row count and last timestamp."""
+    return (len(df), df['timestamp'].iloc[-1] if len(df) else None)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_sheets():
+    return load_sheets_data()
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _df_fingerprint})
+def _cached_health_scores(df):
+    df = add_health_scores(df)
+    # Halve the bytes pushed through plotting, trend and anomaly code
+    float_cols = [c for c in FLOAT32_COLUMNS if c in df.columns]
+    df[float_cols] = df[float_cols].astype(np.float32, copy=False)
+    if 'ZVS_status' in df.columns:
+        df['ZVS_status'] = df['ZVS_status'].astype(bool, copy=False)
+    return df
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _df_fingerprint})
+def _cached_recommendations(df):
+    """Recommendations for a sheet snapshot."""
+    return DABRecommendations().generate_recommendations(df)
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _df_fingerprint})
+def _cached_parameter_optimization(df):
+    return DABRecommendations().get_parameter_optimization(df)
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _df_fingerprint})
+def _cached_trends(df, hours):
+    return analyze_trends(df, hours=hours)
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _df_fingerprint})
+def _performance_figure(recent_df):
+    """Performance monitoring subplots; rebuilt only when the plotted tail changes."""
+    # Pull each plotted column out once as a raw ndarray
+    cols = {k: recent_df[k].to_numpy() for k in PERFORMANCE_COLUMNS if k in recent_df.columns}
+    
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('Efficiency Trend', 'Temperature Trend', 'Health Score Trend', 'ZVS Status')
+    )
+    
+    # Efficiency trend
+    fig.add_trace(
+        go.Scatter(x=cols['timestamp'], y=cols['efficiency_percent'], 
+                  mode='lines+markers', name='Efficiency'),
+        row=1, col=1
+    )
+    
+    # Temperature trend
+    fig.add_trace(
+        go.Scatter(x=cols['timestamp'], y=cols['temperature_C'], 
+                  mode='lines+markers', name='Temperature'),
+        row=1, col=2
+    )
+    
+    # Health score trend
+    fig.add_trace(
+        go.Scatter(x=cols['timestamp'], y=cols['health_score'], 
+                  mode='lines+markers', name='Health Score'),
+        row=2, col=1
+    )
+    
+    # ZVS status
+    if 'ZVS_status' in cols:
+        zvs_values = cols['ZVS_status'].astype(np.int8)
+        fig.add_trace(
+            go.Scatter(x=cols['timestamp'], y=zvs_values, 
+                      mode='lines+markers', name='ZVS Status'),
+            row=2, col=2
+        )
+    
+    fig.update_layout(height=600, showlegend=True)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _format_recommendations(recommendations):
+    """Numbered display lines for the top five recommendations (backend returns them sorted)."""
+    return [f"{i}. {rec}" for i, rec in enumerate(recommendations[:5], 1)]
+
+@st.cache_data(show_spinner=False)
+def _recommendations_csv(recommendations):
+    """CSV export of the recommendations, written with the csv module (no DataFrame)."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    writer.writerow(['Recommendation'])
+    writer.writerows((rec,) for rec in recommendations)
+    return buf.getvalue()
+
+def _implementation_df(impl_cols):
+    """DataFrame view of the tracking records, rebuilt only when a record is added."""
+    # Memoized per session: a global st.cache_data keyed on row count would mix sessions
+    cached = st.session_state.get('impl_df')
+    if cached is None or cached[0] != len(impl_cols['Action']):
+        cached = (len(impl_cols['Action']), pd.DataFrame(impl_cols))
+        st.session_state.impl_df = cached
+    return cached[1]
+
 def show():
     st.title("💡 DAB HealthAI — Recommendations Panel")
     st.write("Get actionable recommendations to optimize DAB converter performance and restore ZVS operation.")
     
     # Load data
-    df = load_sheets_data()
-    if df.empty:
+    df = _cached_sheets()
+    if df is None or len(df) == 0:
         st.error("No data available. Please ensure data is loaded first.")
         return
     
-    df = add_health_scores(df)
-    df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+    df = _cached_health_scores(df)
     
     # Initialize components
-    recommender = DABRecommendations()
     simulator = DABSimulator()
     
-    # Get latest data
-    latest = df.iloc[-1] if not df.empty else None
-    
-    if latest is None:
-        st.error("No data available for analysis.")
-        return
-    
-    # Current status overview
-    st.subheader("Current System Status")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        efficiency = latest.get('efficiency_percent', 0)
-        st.metric(
-            "Efficiency", 
-            f"{efficiency:.2f}%",
-            delta=f"{efficiency - 95:.2f}%" if efficiency < 95 else None
-        )
-    
-    with col2:
-        temperature = latest.get('temperature_C', 0)
-        st.metric(
-            "Temperature", 
-            f"{temperature:.1f}°C",
-            delta=f"{temperature - 60:.1f}°C" if temperature > 60 else None
-        )
-    
-    with col3:
-        health_score = latest.get('health_score', 0)
-        st.metric(
-            "Health Score", 
-            f"{health_score:.1f}/100",
-            delta=f"{health_score - 80:.1f}" if health_score < 80 else None
-        )
-    
-    with col4:
-        zvs_status = latest.get('ZVS_status', False)
-        st.metric(
-            "ZVS Status", 
-            "✅ ZVS" if zvs_status else "❌ No ZVS",
-            delta="ZVS Active" if zvs_status else "ZVS Lost"
-        )
-    
-    # Generate recommendations
-    st.subheader("Actionable Recommendations")
+    # Unbox every scalar the panel needs from the latest row once
+    latest = df.tail(1).to_dict('records')[0]
+    latest_values = {k: latest.get(k, default) for k, default in LATEST_DEFAULTS}
     
-    # Get anomalies and recommendations
-    anomalies = detect_anomalies(df)
-    recommendations = recommender.generate_recommendations(df)
+    section = st.radio("Section", PANEL_SECTIONS, horizontal=True, label_visibility="collapsed")
     
-    if recommendations:
-        # Display top recommendations (simple list)
-        for i, rec in enumerate(recommendations[:5], 1):
-            st.write(f"{i}. {rec}")
-    
-    else:
-        st.success("✅ All systems are operating optimally! No recommendations needed at this time.")
-    
-    # Parameter optimization suggestions
-    st.subheader("Parameter Optimization Suggestions")
-    
-    # Get optimization suggestions
-    optimization_suggestions = recommender.get_parameter_optimization(df)
-    
-    if optimization_suggestions:
-        for param, suggestion in optimization_suggestions.items():
-            with st.expander(f"🔧 {param.upper()} Optimization"):
-                if param == 'phi':
-                    st.write(f"**Current Value:** {suggestion['current']:.3f}")
-                    st.write(f"**Suggested Value:** {suggestion['suggested']:.3f}")
-                    st.write(f"**Reason:** {suggestion['reason']}")
-                    st.write(f"**Expected Impact:** {suggestion['expected_impact']}")
+    # Only the selected section runs, so the other sections' analytics are skipped on reruns
+    if section == "Status":
+        # Current status overview
+        st.subheader("Current System Status")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            efficiency = latest_values['efficiency_percent']
+            st.metric(
+                "Efficiency", 
+                f"{efficiency:.2f}%",
+                delta=f"{efficiency - 95:.2f}%" if efficiency < 95 else None
+            )
+        
+        with col2:
+            temperature = latest_values['temperature_C']
+            st.metric(
+                "Temperature", 
+                f"{temperature:.1f}°C",
+                delta=f"{temperature - 60:.1f}°C" if temperature > 60 else None
+            )
+        
+        with col3:
+            health_score = latest_values['health_score']
+            st.metric(
+                "Health Score", 
+                f"{health_score:.1f}/100",
+                delta=f"{health_score - 80:.1f}" if health_score < 80 else None
+            )
+        
+        with col4:
+            zvs_status = latest_values['ZVS_status']
+            st.metric(
+                "ZVS Status", 
+                "✅ ZVS" if zvs_status else "❌ No ZVS",
+                delta="ZVS Active" if zvs_status else "ZVS Lost"
+            )
+        
+        # ZVS restoration recommendations
+        st.subheader("ZVS Restoration Recommendations")
+        
+        if 'ZVS_status' in df.columns and not latest_values['ZVS_status']:
+            st.warning("🚨 ZVS operation has been lost! Here are specific recommendations to restore it:")
+            
+            for i, (title, description, impact, effort, risk, value_fn) in enumerate(ZVS_STRATEGIES):
+                with st.expander(f"🔄 {title}"):
+                    current_value, suggested_value = value_fn(latest_values)
+                    st.write(f"**Description:** {description}")
+                    st.write(f"**Current Value:** {current_value}")
+                    st.write(f"**Suggested Value:** {suggested_value}")
+                    st.write(f"**Expected Impact:** {impact}")
+                    st.write(f"**Implementation Effort:** {effort}")
+                    st.write(f"**Risk Level:** {risk}")
                     
-                    # Show impact simulation
-                    if st.button(f"Simulate {param} Change"):
-                        # Run simulation with current and suggested values
-                        current_params = {
-                            'Vdc1': latest.get('Vdc1', 400.0),
-                            'Vdc2': latest.get('Vdc2', 48.0),
-                            'phi': suggestion['current'],
-                            'delta1': latest.get('delta1', 0.5),
-                            'delta2': latest.get('delta2', 0.5),
-                            'Pload': latest.get('Pload', 1000.0),
-                            'fsw': latest.get('fsw', 100000),
-                            'L': 50e-6,
-                            'R_on': 0.1,
-                            'C_oss': 100e-12
-                        }
-                        
-                        suggested_params = current_params.copy()
-                        suggested_params['phi'] = suggestion['suggested']
-                        
-                        # Run simulations
-                        current_sim = simulator.run_simulation(current_params)
-                        suggested_sim = simulator.run_simulation(suggested_params)
-                        
-                        # Display comparison
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.write("**Current Parameters:**")
-                            st.write(f"• Efficiency: {current_sim['efficiency']:.2f}%")
-                            st.write(f"• Temperature: {current_sim['temperature']:.1f}°C")
-                            st.write(f"• ZVS: {'✅' if current_sim['zvs_status']['overall_zvs'] else '❌'}")
-                        
-                        with col2:
-                            st.write("**Suggested Parameters:**")
-                            st.write(f"• Efficiency: {suggested_sim['efficiency']:.2f}%")
-                            st.write(f"• Temperature: {suggested_sim['temperature']:.1f}°C")
-                            st.write(f"• ZVS: {'✅' if suggested_sim['zvs_status']['overall_zvs'] else '❌'}")
-                        
-                        # Calculate improvements
-                        eff_improvement = suggested_sim['efficiency'] - current_sim['efficiency']
-                        temp_improvement = current_sim['temperature'] - suggested_sim['temperature']
-                        zvs_improvement = suggested_sim['zvs_status']['overall_zvs'] - current_sim['zvs_status']['overall_zvs']
-                        
-                        st.success(f"""
-                        **Expected Improvements:**
-                        • Efficiency: {eff_improvement:+.2f}%
-                        • Temperature: {temp_improvement:+.1f}°C
-                        • ZVS Status: {'Restored' if zvs_improvement > 0 else 'No change'}
-                        """)
-                
-                elif param == 'duty_cycles':
-                    st.write(f"**Current Values:**")
-                    st.write(f"• δ₁: {suggestion['current']['delta1']:.2f}")
-                    st.write(f"• δ₂: {suggestion['current']['delta2']:.2f}")
-                    st.write(f"**Suggested Values:**")
-                    st.write(f"• δ₁: {suggestion['suggested']['delta1']:.2f}")
-                    st.write(f"• δ₂: {suggestion['suggested']['delta2']:.2f}")
-                    st.write(f"**Reason:** {suggestion['reason']}")
-                    st.write(f"**Expected Impact:** {suggestion['expected_impact']}")
-    
-    else:
-        st.info("No parameter optimization suggestions at this time.")
+                    if st.button(f"Implement {title}", key=f"zvs_{i}"):
+                        st.success(f"{title} implementation started!")
     
-    # Trend analysis and recommendations
-    st.subheader("Trend-Based Recommendations")
-    
-    # Analyze trends
-    trends = analyze_trends(df, hours=24)
-    
-    if trends:
-        trend_recommendations = []
+    if section == "Recommendations":
+        # Generate recommendations
+        st.subheader("Actionable Recommendations")
         
-        for metric, trend in trends.items():
-            if trend['pct_change'] < -5:  # More than 5% degradation
-                if metric == 'efficiency_percent':
-                    trend_recommendations.append({
-                        'metric': metric,
-                        'trend': trend,
-                        'action': 'Investigate efficiency degradation trend',
-                        'priority': 'medium',
-                        'impact': 'Identify root cause of performance decline'
-                    })
-                elif metric == 'temperature_C':
-                    trend_recommendations.append({
-                        'metric': metric,
-                        'trend': trend,
-                        'action': 'Monitor temperature trend and check cooling system',
-                        'priority': 'medium',
-                        'impact': 'Prevent thermal runaway and component damage'
-                    })
-                elif metric == 'health_score':
-                    trend_recommendations.append({
-                        'metric': metric,
-                        'trend': trend,
-                        'action': 'Perform preventive maintenance on power components',
-                        'priority': 'high',
-                        'impact': 'Prevent further degradation and potential failures'
-                    })
+        # Get recommendations
+        recommendations = _cached_recommendations(df)
+        
+        if recommendations:
+            # Display top recommendations (simple list)
+            for line in _format_recommendations(tuple(recommendations)):
+                st.write(line)
         
-        if trend_recommendations:
-            for rec in trend_recommendations:
-                with st.expander(f"📈 {rec['action']}"):
-                    st.write(f"**Metric:** {rec['metric'].replace('_', ' ').title()}")
-                    st.write(f"**Trend:** {rec['trend']['trend']}")
-                    st.write(f"**Change:** {rec['trend']['pct_change']:+.1f}%")
-                    st.write(f"**Priority:** {rec['priority'].title()}")
-                    st.write(f"**Impact:** {rec['impact']}")
         else:
-            st.success("✅ No concerning trends detected.")
-    else:
-        st.info("Insufficient data for trend analysis.")
-    
-    # ZVS restoration recommendations
-    st.subheader("ZVS Restoration Recommendations")
-    
-    if not latest.get('ZVS_status', True):
-        st.warning("🚨 ZVS operation has been lost! Here are specific recommendations to restore it:")
+            st.success("✅ All systems are operating optimally! No recommendations needed at this time.")
         
-        # ZVS restoration strategies
-        zvs_strategies = [
-            {
-                'strategy': 'Increase Phase Shift (φ)',
-                'description': 'Gradually increase phase shift to restore ZVS conditions',
-                'current_value': latest.get('phi', 0.3),
-                'suggested_value': min(np.pi/2, latest.get('phi', 0.3) + 0.05),
-                'impact': 'Restore ZVS operation, reduce switching losses',
-                'effort': 'Low',
-                'risk': 'Low'
-            },
-            {
-                'strategy': 'Optimize Duty Cycles',
-                'description': 'Balance duty cycles for optimal transformer current',
-                'current_value': f"δ₁: {latest.get('delta1', 0.5):.2f}, δ₂: {latest.get('delta2', 0.5):.2f}",
-                'suggested_value': f"δ₁: 0.50, δ₂: 0.50",
-                'impact': 'Improve current balance, enhance ZVS margin',
-                'effort': 'Low',
-                'risk': 'Low'
-            },
-            {
-                'strategy': 'Reduce Switching Frequency',
-                'description': 'Lower switching frequency to improve ZVS margin',
-                'current_value': f"{latest.get('fsw', 100000)/1000:.0f} kHz",
-                'suggested_value': f"{latest.get('fsw', 100000)*0.9/1000:.0f} kHz",
-                'impact': 'Increase ZVS margin, reduce switching losses',
-                'effort': 'Medium',
-                'risk': 'Medium'
-            }
-        ]
+        # Parameter optimization suggestions
+        st.subheader("Parameter Optimization Suggestions")
+        
+        # Get optimization suggestions
+        optimization_suggestions = _cached_parameter_optimization(df)
+        
+        if optimization_suggestions:
+            for param, suggestion in optimization_suggestions.items():
+                with st.expander(f"🔧 {param.upper()} Optimization"):
+                    if param == 'phi':
+                        st.markdown(PHI_SUGGESTION_MD.format_map(suggestion))
+                        
+                        # Show impact simulation
+                        if st.button(f"Simulate {param} Change"):
+                            # Run simulation with current and suggested values
+                            current_params = {
+                                'Vdc1': latest_values['Vdc1'],
+                                'Vdc2': latest_values['Vdc2'],
+                                'phi': suggestion['current'],
+                                'delta1': latest_values['delta1'],
+                                'delta2': latest_values['delta2'],
+                                'Pload': latest_values['Pload'],
+                                'fsw': latest_values['fsw'],
+                                'L': 50e-6,
+                                'R_on': 0.1,
+                                'C_oss': 100e-12
+                            }
+                            
+                            suggested_params = current_params.copy()
+                            suggested_params['phi'] = suggestion['suggested']
+                            
+                            # Run both simulations in one batched call; repeat clicks reuse the result
+                            sim_cache = st.session_state.setdefault('phi_sim_cache', {})
+                            sim_key = (current_params['phi'],) + tuple(sorted(suggested_params.items()))
+                            if sim_key not in sim_cache:
+                                sim_cache[sim_key] = simulator.run_batch([current_params, suggested_params])
+                            current_sim, suggested_sim = sim_cache[sim_key]
+                            
+                            # Display comparison
+                            col1, col2 = st.columns(2)
+                            
+                            with col1:
+                                st.markdown(SIM_RESULT_MD.format_map(
+                                    dict(current_sim, label='Current', zvs='✅' if current_sim['zvs_status'] else '❌')
+                                ))
+                            
+                            with col2:
+                                st.markdown(SIM_RESULT_MD.format_map(
+                                    dict(suggested_sim, label='Suggested', zvs='✅' if suggested_sim['zvs_status'] else '❌')
+                                ))
+                            
+                            # Calculate improvements
+                            eff_improvement = suggested_sim['efficiency'] - current_sim['efficiency']
+                            temp_improvement = current_sim['temperature'] - suggested_sim['temperature']
+                            zvs_improvement = int(suggested_sim['zvs_status']) - int(current_sim['zvs_status'])
+                            
+                            st.success(f"""
+                            **Expected Improvements:**
+                            • Efficiency: {eff_improvement:+.2f}%
+                            • Temperature: {temp_improvement:+.1f}°C
+                            • ZVS Status: {'Restored' if zvs_improvement > 0 else 'No change'}
+                            """)
+                    
+                    elif param == 'duty_cycles':
+                        st.markdown(DUTY_SUGGESTION_MD.format_map(suggestion))
+        
+        else:
+            st.info("No parameter optimization suggestions at this time.")
+        
+        # Export recommendations
+        st.subheader("Export & Share")
         
-        for i, strategy in enumerate(zvs_strategies):
-            with st.expander(f"🔄 {strategy['strategy']}"):
-                st.write(f"**Description:** {strategy['description']}")
-                st.write(f"**Current Value:** {strategy['current_value']}")
-                st.write(f"**Suggested Value:** {strategy['suggested_value']}")
-                st.write(f"**Expected Impact:** {strategy['impact']}")
-                st.write(f"**Implementation Effort:** {strategy['effort']}")
-                st.write(f"**Risk Level:** {strategy['risk']}")
-                
-                if st.button(f"Implement {strategy['strategy']}", key=f"zvs_{i}"):
-                    st.success(f"{strategy['strategy']} implementation started!")
-    
-    # Implementation tracking
-    st.subheader("Recommendation Implementation Tracking")
-    
-    # Mock implementation data (in real app, this would come from database)
-    if 'implemented_recommendations' not in st.session_state:
-        st.session_state.implemented_recommendations = []
-    
-    if st.session_state.implemented_recommendations:
-        implementation_df = pd.DataFrame(st.session_state.implemented_recommendations)
-        st.dataframe(implementation_df, use_container_width=True)
-    else:
-        st.info("No recommendations have been implemented yet.")
-    
-    # Add new implementation
-    with st.expander("➕ Add Implementation Record"):
         col1, col2 = st.columns(2)
         
         with col1:
-            rec_action = st.text_input("Recommendation Action")
-            implementation_date = st.date_input("Implementation Date")
+            if st.button("📊 Export Recommendations"):
+                if recommendations:
+                    st.download_button(
+                        label="📥 Download CSV",
+                        data=_recommendations_csv(tuple(recommendations)),
+                        file_name="dab_recommendations.csv",
+                        mime="text/csv"
+                    )
+                else:
+                    st.info("No recommendations to export.")
         
         with col2:
-            status = st.selectbox("Status", ["Completed", "In Progress", "On Hold"])
-            notes = st.text_area("Implementation Notes")
-        
-        if st.button("Add Implementation"):
-            if rec_action:
-                new_implementation = {
-                    'Action': rec_action,
-                    'Date': implementation_date,
-                    'Status': status,
-                    'Notes': notes
-                }
-                st.session_state.implemented_recommendations.append(new_implementation)
-                st.success("Implementation record added!")
-                st.rerun()
-    
-    # Export recommendations
-    st.subheader("Export & Share")
-    
-    col1, col2 = st.columns(2)
+            if st.button("📧 Email Summary"):
+                st.info("Email summary feature would be implemented here.")
     
-    with col1:
-        if st.button("📊 Export Recommendations"):
-            if recommendations:
-                rec_df = pd.DataFrame({'Recommendation': recommendations})
-                csv = rec_df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download CSV",
-                    data=csv,
-                    file_name="dab_recommendations.csv",
-                    mime="text/csv"
-                )
-            else:
-                st.info("No recommendations to export.")
-    
-    with col2:
-        if st.button("📧 Email Summary"):
-            st.info("Email summary feature would be implemented here.")
-    
-    # Performance monitoring
-    st.subheader("Performance Monitoring")
-    
-    # Show recent performance trends
-    if len(df) > 1:
-        # Create performance trend chart
-        recent_df = df.tail(50)  # Last 50 data points
+    if section == "Trends":
+        # Trend analysis and recommendations
+        st.subheader("Trend-Based Recommendations")
         
-        fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=('Efficiency Trend', 'Temperature Trend', 'Health Score Trend', 'ZVS Status')
-        )
+        # Analyze trends
+        trends = _cached_trends(df, 24)
         
-        # Efficiency trend
-        fig.add_trace(
-            go.Scatter(x=recent_df['timestamp'], y=recent_df['efficiency_percent'], 
-                      mode='lines+markers', name='Efficiency'),
-            row=1, col=1
-        )
+        if trends:
+            trend_recommendations = []
+            
+            for metric, trend in trends.items():
+                rule = TREND_RULES.get(metric)
+                if rule and trend['pct_change'] < -5:  # More than 5% degradation
+                    action, priority, impact = rule
+                    trend_recommendations.append({
+                        'metric': metric,
+                        'trend': trend,
+                        'action': action,
+                        'priority': priority,
+                        'impact': impact
+                    })
+            
+            if trend_recommendations:
+                for rec in trend_recommendations:
+                    with st.expander(f"📈 {rec['action']}"):
+                        st.write(f"**Metric:** {rec['metric'].replace('_', ' ').title()}")
+                        st.write(f"**Trend:** {rec['trend']['trend']}")
+                        st.write(f"**Change:** {rec['trend']['pct_change']:+.1f}%")
+                        st.write(f"**Priority:** {rec['priority'].title()}")
+                        st.write(f"**Impact:** {rec['impact']}")
+            else:
+                st.success("✅ No concerning trends detected.")
+        else:
+            st.info("Insufficient data for trend analysis.")
+    
+    if section == "Perf Monitor":
+        # Performance monitoring
+        st.subheader("Performance Monitoring")
         
-        # Temperature trend
-        fig.add_trace(
-            go.Scatter(x=recent_df['timestamp'], y=recent_df['temperature_C'], 
-                      mode='lines+markers', name='Temperature'),
-            row=1, col=2
-        )
+        # Show recent performance trends
+        if len(df) > 1:
+            # Create performance trend chart
+            recent_df = df.tail(50)  # Last 50 data points
+            
+            fig = _performance_figure(recent_df)
+            
+            st.plotly_chart(fig, use_container_width=True)
+    
+    if section == "Tracking":
+        # Implementation tracking
+        st.subheader("Recommendation Implementation Tracking")
         
-        # Health score trend
-        fig.add_trace(
-            go.Scatter(x=recent_df['timestamp'], y=recent_df['health_score'], 
-                      mode='lines+markers', name='Health Score'),
-            row=2, col=1
-        )
+        # Mock implementation data (in real app, this would come from database)
+        # Stored column-wise so new records are per-column appends
+        if 'impl_cols' not in st.session_state:
+            st.session_state.impl_cols = {'Action': [], 'Date': [], 'Status': [], 'Notes': []}
         
-        # ZVS status
-        if 'ZVS_status' in recent_df.columns:
-            zvs_values = recent_df['ZVS_status'].astype(int)
-            fig.add_trace(
-                go.Scatter(x=recent_df['timestamp'], y=zvs_values, 
-                          mode='lines+markers', name='ZVS Status'),
-                row=2, col=2
-            )
+        impl_cols = st.session_state.impl_cols
+        if impl_cols['Action']:
+            st.dataframe(_implementation_df(impl_cols), use_container_width=True)
+        else:
+            st.info("No recommendations have been implemented yet.")
         
-        fig.update_layout(height=600, showlegend=True)
-        st.plotly_chart(fig, use_container_width=True)
+        # Add new implementation
+        with st.expander("➕ Add Implementation Record"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                rec_action = st.text_input("Recommendation Action")
+                implementation_date = st.date_input("Implementation Date")
+            
+            with col2:
+                status = st.selectbox("Status", ["Completed", "In Progress", "On Hold"])
+                notes = st.text_area("Implementation Notes")
+            
+            if st.button("Add Implementation"):
+                if rec_action:
+                    for column, value in (('Action', rec_action), ('Date', implementation_date),
+                                          ('Status', status), ('Notes', notes)):
+                        impl_cols[column].append(value)
+                    st.success("Implementation record added!")
+                    st.rerun()
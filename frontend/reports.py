@@ -1,29 +1,132 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import sys
 import os
 from datetime import datetime, timedelta
-import tempfile
+import io
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from backend.sheets_loader import load_sheets_data
 from backend.reports import create_health_report
-from backend.diagnostics import add_health_scores, detect_anomalies, generate_basic_recommendations
+from backend.diagnostics import add_health_scores, detect_anomalies_df, generate_basic_recommendations, analyze_trends
 from backend.alerting import DABAlerting
 
+def _df_fingerprint(df):
+    """Cheap cache key for a DataFrame: row count plus first and last timestamp."""
+    if len(df) == 0:
+        return (0, None, None)
+    return (len(df), df['timestamp'].iloc[0], df['timestamp'].iloc[-1])
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_prepared():
+    """Sheet data (timestamps already parsed by the loader) with health scores, in time order."""
+    df = load_sheets_data()
+    if df.empty:
+        return df
+    df = add_health_scores(df)
+    return df.dropna(subset=['timestamp']).sort_values('timestamp', kind='stable', ignore_index=True)
+
+def _filter(df, start, end):
+    """Rows with start <= timestamp <= end, as a positional slice of the sorted frame."""
+    ts = df['timestamp'].to_numpy()
+    lo = np.searchsorted(ts, start.to_datetime64(), side='left')
+    hi = np.searchsorted(ts, end.to_datetime64(), side='right')
+    return df.iloc[lo:hi]
+
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs={pd.DataFrame: _df_fingerprint})
+def _anomalies(df):
+    return detect_anomalies_df(df)
+
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs={pd.DataFrame: _df_fingerprint})
+def _basic_recommendations(df):
+    return generate_basic_recommendations(df)
+
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs={pd.DataFrame: _df_fingerprint})
+def _trends(df, hours):
+    return analyze_trends(df, hours=hours)
+
+# Smallest date range (in rows) that gets the full analysis
+MIN_ROWS = 2
+
+STAT_COLUMNS = ['efficiency_percent', 'temperature_C', 'health_score']
+
+STAT_LABELS = {'efficiency_percent': "Efficiency", 'temperature_C': "Temperature", 'health_score': "Health Score"}
+STAT_FORMATS = {'efficiency_percent': "{:.2f}%", 'temperature_C': "{:.1f}°C", 'health_score': "{:.1f}"}
+
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs={pd.DataFrame: _df_fingerprint})
+def _summary_stats(df):
+    """min/max/mean/std for STAT_COLUMNS in a single aggregation."""
+    return df[STAT_COLUMNS].agg(['min', 'max', 'mean', 'std'])
+
+# The message column only restates metric/value/threshold, so it is not sent to the browser
+ANOMALY_DISPLAY_COLUMNS = ['timestamp', 'metric', 'value', 'threshold', 'severity']
+
+def _severity_style(col):
+    """Background colour per severity cell, computed for the whole column at once."""
+    return np.where(
+        col.eq('critical'), 'background-color: #ffcccc',
+        np.where(col.eq('warning'), 'background-color: #fff2cc', '')
+    ).tolist()
+
+def _requested(section, label=None):
+    """Whether `section` was computed for the current date range; with a label, offer a button to compute it."""
+    done = st.session_state.report_sections
+    if label and section not in done and st.button(label, key=f"compute_{section}"):
+        done.add(section)
+    return section in done
+
+PDF_POLL_SECONDS = 0.5
+
+@st.cache_resource
+def _pdf_executor():
+    # One worker shared by every session: report plots go through pyplot's global
+    # state, so concurrent reports queue here instead of running side by side
+    return ThreadPoolExecutor(max_workers=1)
+
+def _sync_pdf_job(key):
+    """Drop this session's PDF job if it was made for other settings than `key`."""
+    job = st.session_state.get('pdf_job')
+    if job is not None and job['key'] != key:
+        # Frees the shared worker if the job has not started yet
+        job['future'].cancel()
+        del st.session_state['pdf_job']
+
+@st.fragment(run_every=PDF_POLL_SECONDS)
+def _pdf_progress():
+    """Status of this session's pending PDF job; only this fragment reruns while it waits."""
+    job = st.session_state.get('pdf_job')
+    if job is None or job['future'].done():
+        # One full rerun swaps the status line for the download button
+        st.rerun()
+    if job['future'].running():
+        st.info("⏳ Generating PDF report in the background...")
+    else:
+        st.info("⏳ PDF report queued behind other reports...")
+
+def _build_pdf(df, report_type):
+    """Render the PDF report in memory and return its bytes."""
+    buf = io.BytesIO()
+    create_health_report(df, report_type=report_type, output_path=buf)
+    return buf.getvalue()
+
+REPORT_CACHES = (_load_prepared, _anomalies, _basic_recommendations, _trends, _summary_stats)
+
 def show():
     st.title("📊 DAB HealthAI — Health Reports")
     st.write("Generate comprehensive health reports with one-click PDF generation.")
     
+    if st.sidebar.button("🧹 Clear report cache", help="Drop cached report data and analysis results"):
+        for cached in REPORT_CACHES:
+            cached.clear()
+    
     # Load data
-    df = load_sheets_data()
+    df = _load_prepared()
     if df.empty:
         st.error("No data available. Please ensure data is loaded first.")
         return
     
-    df = add_health_scores(df)
-    df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
-    
     # Report configuration
     st.subheader("Report Configuration")
     
@@ -74,190 +177,173 @@ def show():
             max_value=max_date.date()
         )
     
+    # A generated PDF only stays on screen for the settings it was made with
+    pdf_key = (start_date, end_date, report_type)
+    _sync_pdf_job(pdf_key)
+    
     # Filter data for selected range
     start_datetime = pd.Timestamp(start_date)
     end_datetime = pd.Timestamp(end_date) + pd.Timedelta(days=1)
     
-    filtered_df = df[(df['timestamp'] >= start_datetime) & (df['timestamp'] <= end_datetime)]
+    filtered_df = _filter(df, start_datetime, end_datetime)
     
     if filtered_df.empty:
         st.warning("No data available for the selected date range.")
         return
     
-    # Data summary
-    st.subheader("Data Summary")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric("Data Points", len(filtered_df))
-    
-    with col2:
-        avg_efficiency = filtered_df['efficiency_percent'].mean()
-        st.metric("Avg Efficiency", f"{avg_efficiency:.2f}%")
-    
-    with col3:
-        avg_temp = filtered_df['temperature_C'].mean()
-        st.metric("Avg Temperature", f"{avg_temp:.1f}°C")
-    
-    with col4:
-        avg_health = filtered_df['health_score'].mean()
-        st.metric("Avg Health Score", f"{avg_health:.1f}")
-    
-    # Anomaly detection
-    if include_anomalies:
-        st.subheader("Anomaly Detection")
+    # Stats, trends and reports need at least MIN_ROWS readings
+    enough_rows = len(filtered_df) >= MIN_ROWS
+    
+    if not enough_rows:
+        reading = filtered_df.iloc[0]
+        st.info(
+            f"Only one reading ({reading['timestamp']:%Y-%m-%d %H:%M}) in the selected range — "
+            f"widen the date range for statistics, trends and PDF reports.\n\n"
+            f"Efficiency: {reading['efficiency_percent']:.2f}% · "
+            f"Temperature: {reading['temperature_C']:.1f}°C · "
+            f"Health Score: {reading['health_score']:.1f}"
+        )
+    else:
+        stats = _summary_stats(filtered_df)
+        means = stats.loc['mean']
         
-        anomalies = detect_anomalies(filtered_df)
+        # Data summary
+        st.subheader("Data Summary")
         
-        if anomalies:
-            st.warning(f"🚨 {len(anomalies)} anomalies detected in the selected period!")
-            
-            # Display anomalies
-            anomaly_df = pd.DataFrame(anomalies)
-            anomaly_df['timestamp'] = pd.to_datetime(anomaly_df['timestamp'])
-            
-            # Color code by severity
-            def color_severity(severity):
-                if severity == 'critical':
-                    return 'background-color: #ffcccc'
-                elif severity == 'warning':
-                    return 'background-color: #fff2cc'
-                else:
-                    return ''
-            
-            styled_anomaly_df = anomaly_df.style.applymap(
-                lambda x: color_severity(x) if x in ['critical', 'warning'] else '',
-                subset=['severity']
-            )
-            
-            st.dataframe(styled_anomaly_df, use_container_width=True)
-        else:
-            st.success("✅ No anomalies detected in the selected period.")
-    
-    # Recommendations
-    if include_recommendations:
-        st.subheader("Recommendations")
+        col1, col2, col3, col4 = st.columns(4)
         
-        recommendations = generate_basic_recommendations(filtered_df)
+        with col1:
+            st.metric("Data Points", len(filtered_df))
         
-        if recommendations:
-            for i, rec in enumerate(recommendations[:5], 1):
-                st.write(f"{i}. {rec}")
-        else:
-            st.success("✅ No recommendations needed. System is operating optimally!")
-    
-    # Trend analysis
-    st.subheader("Trend Analysis")
-    
-    from backend.diagnostics import analyze_trends
-    
-    # Analyze trends for the selected period
-    trends = analyze_trends(filtered_df, hours=int((end_datetime - start_datetime).total_seconds() / 3600))
-    
-    if trends:
-        trend_data = []
-        for metric, trend in trends.items():
-            trend_data.append({
-                'Metric': metric.replace('_', ' ').title(),
-                'Trend': trend['trend'].title(),
-                'Change (%)': f"{trend['pct_change']:+.1f}%",
-                'Current Value': f"{trend['current']:.2f}",
-                'Average Value': f"{trend['average']:.2f}"
-            })
+        with col2:
+            st.metric("Avg Efficiency", f"{means['efficiency_percent']:.2f}%")
         
-        trend_df = pd.DataFrame(trend_data)
-        st.dataframe(trend_df, use_container_width=True)
-    else:
-        st.info("Insufficient data for trend analysis.")
-    
-    # Performance metrics
-    st.subheader("Performance Metrics")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Efficiency distribution
-        st.write("**Efficiency Distribution**")
-        efficiency_stats = filtered_df['efficiency_percent'].describe()
-        st.write(f"• Min: {efficiency_stats['min']:.2f}%")
-        st.write(f"• Max: {efficiency_stats['max']:.2f}%")
-        st.write(f"• Mean: {efficiency_stats['mean']:.2f}%")
-        st.write(f"• Std: {efficiency_stats['std']:.2f}%")
+        with col3:
+            st.metric("Avg Temperature", f"{means['temperature_C']:.1f}°C")
         
-        # Temperature analysis
-        st.write("**Temperature Analysis**")
-        temp_stats = filtered_df['temperature_C'].describe()
-        st.write(f"• Min: {temp_stats['min']:.1f}°C")
-        st.write(f"• Max: {temp_stats['max']:.1f}°C")
-        st.write(f"• Mean: {temp_stats['mean']:.1f}°C")
-        st.write(f"• Std: {temp_stats['std']:.1f}°C")
-    
-    with col2:
-        # Health score analysis
-        st.write("**Health Score Analysis**")
-        health_stats = filtered_df['health_score'].describe()
-        st.write(f"• Min: {health_stats['min']:.1f}")
-        st.write(f"• Max: {health_stats['max']:.1f}")
-        st.write(f"• Mean: {health_stats['mean']:.1f}")
-        st.write(f"• Std: {health_stats['std']:.1f}")
+        with col4:
+            st.metric("Avg Health Score", f"{means['health_score']:.1f}")
+        
+        # Analyses below only run once requested for the current date range
+        range_key = (start_date, end_date)
+        if st.session_state.get('report_range') != range_key:
+            st.session_state.report_range = range_key
+            st.session_state.report_sections = set()
         
-        # ZVS status
-        if 'ZVS_status' in filtered_df.columns:
-            zvs_counts = filtered_df['ZVS_status'].value_counts()
-            st.write("**ZVS Status Distribution**")
-            for status, count in zvs_counts.items():
-                percentage = (count / len(filtered_df)) * 100
-                st.write(f"• {status}: {count} ({percentage:.1f}%)")
+        # Anomaly detection
+        if include_anomalies:
+            with st.expander("🚨 Anomaly Detection", expanded=_requested('anomalies')):
+                if _requested('anomalies', "Detect anomalies"):
+                    anomaly_df = _anomalies(filtered_df)
+                    
+                    if not anomaly_df.empty:
+                        st.warning(f"🚨 {len(anomaly_df)} anomalies detected in the selected period!")
+                        
+                        # Color code by severity
+                        styled_anomaly_df = anomaly_df[ANOMALY_DISPLAY_COLUMNS].style.apply(_severity_style, subset=['severity'])
+                        
+                        st.dataframe(styled_anomaly_df, use_container_width=True)
+                    else:
+                        st.success("✅ No anomalies detected in the selected period.")
+        
+        # Recommendations
+        if include_recommendations:
+            with st.expander("💡 Recommendations", expanded=_requested('recommendations')):
+                if _requested('recommendations', "Generate recommendations"):
+                    recommendations = _basic_recommendations(filtered_df)
+                    
+                    if recommendations:
+                        for i, rec in enumerate(recommendations[:5], 1):
+                            st.write(f"{i}. {rec}")
+                    else:
+                        st.success("✅ No recommendations needed. System is operating optimally!")
+        
+        # Trend analysis
+        with st.expander("📈 Trend Analysis", expanded=_requested('trends')):
+            if _requested('trends', "Analyze trends"):
+                # Analyze trends for the selected period
+                trends = _trends(filtered_df, int((end_datetime - start_datetime).total_seconds() / 3600))
+                
+                if trends:
+                    trend_data = []
+                    for metric, trend in trends.items():
+                        trend_data.append({
+                            'Metric': metric.replace('_', ' ').title(),
+                            'Trend': trend['trend'].title(),
+                            'Change (%)': f"{trend['pct_change']:+.1f}%",
+                            'Current Value': f"{trend['current']:.2f}",
+                            'Average Value': f"{trend['average']:.2f}"
+                        })
+                    
+                    trend_df = pd.DataFrame(trend_data)
+                    st.dataframe(trend_df, use_container_width=True)
+                else:
+                    st.info("Insufficient data for trend analysis.")
+        
+        # Performance metrics
+        st.subheader("Performance Metrics")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Distribution Summary**")
+            st.table(
+                stats.rename(index=str.title, columns=STAT_LABELS)
+                .style.format({STAT_LABELS[c]: fmt for c, fmt in STAT_FORMATS.items()})
+            )
+        
+        with col2:
+            # ZVS status
+            if 'ZVS_status' in filtered_df.columns:
+                zvs_counts = filtered_df['ZVS_status'].value_counts()
+                st.write("**ZVS Status Distribution**")
+                st.table(pd.DataFrame({
+                    'Count': zvs_counts,
+                    'Share (%)': (zvs_counts / len(filtered_df) * 100).round(1)
+                }))
     
     # Generate PDF Report
     st.subheader("Generate PDF Report")
     
-    if st.button("📄 Generate Health Report", type="primary"):
-        with st.spinner("Generating PDF report..."):
-            try:
-                # Create temporary file
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                    # Generate report
-                    pdf_path = create_health_report(
-                        filtered_df, 
-                        report_type=report_type,
-                        output_path=tmp_file.name
-                    )
-                    
-                    # Read the PDF file
-                    with open(pdf_path, 'rb') as pdf_file:
-                        pdf_bytes = pdf_file.read()
-                    
-                    # Clean up temporary file
-                    os.unlink(pdf_path)
-                    
-                    # Provide download button
-                    st.success("✅ PDF report generated successfully!")
-                    
-                    # Create filename
-                    filename = f"DAB_Health_Report_{report_type}_{start_date}_{end_date}.pdf"
-                    
-                    st.download_button(
-                        label="📥 Download PDF Report",
-                        data=pdf_bytes,
-                        file_name=filename,
-                        mime="application/pdf"
-                    )
-                    
-                    # Show report preview info
-                    st.info(f"""
+    if st.button("📄 Generate Health Report", type="primary", disabled=not enough_rows):
+        st.session_state.pdf_job = {
+            'key': pdf_key,
+            # create_health_report adds health_score in place, so the worker gets its own frame
+            'future': _pdf_executor().submit(_build_pdf, filtered_df.copy(), report_type),
+            'filename': f"DAB_Health_Report_{report_type}_{start_date}_{end_date}.pdf",
+            'summary': f"""
                     **Report Summary:**
                     - **Period:** {start_date} to {end_date}
                     - **Data Points:** {len(filtered_df)}
-                    - **Anomalies:** {len(anomalies) if include_anomalies else 0}
-                    - **Recommendations:** {len(recommendations) if include_recommendations else 0}
+                    - **Anomalies:** {len(_anomalies(filtered_df)) if include_anomalies else 0}
+                    - **Recommendations:** {len(_basic_recommendations(filtered_df)) if include_recommendations else 0}
                     - **Report Type:** {report_type.title()}
-                    """)
-                    
-            except Exception as e:
-                st.error(f"❌ Error generating PDF report: {str(e)}")
-                st.error("Please check that all required dependencies are installed.")
+                    """
+        }
+    
+    pdf_job = st.session_state.get('pdf_job')
+    if pdf_job is not None and not pdf_job['future'].done():
+        _pdf_progress()
+    elif pdf_job is not None:
+        try:
+            pdf_bytes = pdf_job['future'].result()
+            
+            # Provide download button
+            st.success("✅ PDF report generated successfully!")
+            
+            st.download_button(
+                label="📥 Download PDF Report",
+                data=pdf_bytes,
+                file_name=pdf_job['filename'],
+                mime="application/pdf"
+            )
+            
+            # Show report preview info
+            st.info(pdf_job['summary'])
+            
+        except Exception as e:
+            st.error(f"❌ Error generating PDF report: {str(e)}")
+            st.error("Please check that all required dependencies are installed.")
     
     # Report templates
     st.subheader("Report Templates")
@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import sys
 import os
@@ -8,12 +7,17 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from backend.simulator import DABSimulator
 from backend.diagnostics import add_health_scores
 
+@st.cache_resource
+def _simulator():
+    """Shared simulator instance."""
+    return DABSimulator()
+
 def show():
     st.title("🔬 DAB Simulator")
     st.write("Simulate DAB converter performance with different parameters.")
     
-    # Initialize simulator
-    simulator = DABSimulator()
+    # Shared simulator
+    simulator = _simulator()
     
     # Sidebar for parameter controls
     st.sidebar.header("Parameters")
@@ -96,16 +100,12 @@ def show():
     from backend.recommendations import DABRecommendations
     recommender = DABRecommendations()
     
-    # Create mock dataframe for recommendations
-    mock_data = pd.DataFrame([{
-        'timestamp': pd.Timestamp.now(),
+    recommendations = recommender.generate_recommendations_scalar({
         'efficiency_percent': results['efficiency'],
         'temperature_C': results['temperature'],
         'health_score': 85.0,
         'ZVS_status': results['zvs_status']
-    }])
-    
-    recommendations = recommender.generate_recommendations(mock_data)
+    })
     
     if recommendations:
         for rec in recommendations:
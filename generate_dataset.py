@@ -1,81 +1,126 @@
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 
 num_samples = 365
 start_date = datetime(2024, 1, 1)
-timestamps = [start_date + timedelta(days=i) for i in range(num_samples)]
-np.random.seed(42)
+timestamps = pd.date_range(start_date, periods=num_samples, freq='D')
+rng = np.random.default_rng(42)
 
-# Only simulate MEASURED values:
-V_dc1 = np.random.normal(160, 3, num_samples)
-I_dc1 = np.random.normal(10, 0.5, num_samples)
+# Output columns and the decimals each one is rounded to
+COLUMNS = {
+    'V_dc1': 2, 'V_dc2': 2, 'I_dc1': 2, 'I_dc2': 2,
+    'delta_1': 3, 'delta_2': 3, 'phi': 3,
+    'L_total_uH': 3, 'R_total_mOhm': 2,
+    'efficiency_percent': 2, 'temperature_C': 1,
+    'input_power_W': 2, 'load_power_W': 2, 'power_loss_W': 3,
+    'switching_loss_W': 3, 'conduction_loss_W': 3,
+}
 
-# Generate secondary as a realistic fraction of primary (e.g., 85–98%)
-v_fraction = np.random.uniform(0.85, 0.98, num_samples)
-i_fraction = np.random.uniform(0.85, 0.98, num_samples)
+# All random draws up front, one block per distribution:
+# measured V_dc1/I_dc1 plus additive noise terms (mean, std) ...
+normal_mean = np.array([160, 10, 0, 0, 0, 0, 0, 0])
+normal_std = np.array([3, 0.5, 0.05, 1, 0.1, 0.5, 0.2, 0.1])
+normal = normal_mean + normal_std * rng.standard_normal((num_samples, normal_mean.size))
+V_dc1, I_dc1, L_noise, R_noise, eff_noise, temp_noise, sw_noise, cond_noise = normal.T
 
-V_dc2 = V_dc1 * v_fraction
-I_dc2 = I_dc1 * i_fraction
+# ... and secondary fractions (85–98% of primary), duty cycles and phase shift
+uniform_low = np.array([0.85, 0.85, 0.4, 0.3, 0.2])
+uniform_high = np.array([0.98, 0.98, 0.6, 0.5, 0.4])
+uniform = rng.uniform(uniform_low, uniform_high, (num_samples, uniform_low.size))
+v_fraction, i_fraction, delta_1, delta_2, phi = uniform.T
 
-# Generate duty cycles and phase shift
-delta_1 = np.random.uniform(0.4, 0.6, num_samples)
-delta_2 = np.random.uniform(0.3, 0.5, num_samples)
-phi = np.random.uniform(0.2, 0.4, num_samples)
+# One column-major matrix; every output column is a contiguous view into it
+mat = np.empty((num_samples, len(COLUMNS)), order='F')
+col = {name: mat[:, i] for i, name in enumerate(COLUMNS)}
 
-input_power_W = V_dc1 * I_dc1
-load_power_W = V_dc2 * I_dc2
-power_loss_W = input_power_W - load_power_W
+# Derived columns are computed in place (out=) on those views; two scratch
+# buffers hold the remaining intermediates
+buf_a = np.empty(num_samples)
+buf_b = np.empty(num_samples)
+
+V_dc2 = col['V_dc2']
+I_dc2 = col['I_dc2']
+np.copyto(col['V_dc1'], V_dc1)
+np.copyto(col['I_dc1'], I_dc1)
+np.multiply(V_dc1, v_fraction, out=V_dc2)
+np.multiply(I_dc1, i_fraction, out=I_dc2)
+np.copyto(col['delta_1'], delta_1)
+np.copyto(col['delta_2'], delta_2)
+np.copyto(col['phi'], phi)
+
+input_power_W = col['input_power_W']
+load_power_W = col['load_power_W']
+power_loss_W = col['power_loss_W']
+np.multiply(V_dc1, I_dc1, out=input_power_W)
+np.multiply(V_dc2, I_dc2, out=load_power_W)
+np.subtract(input_power_W, load_power_W, out=power_loss_W)
 
 # L_total (μH) - from DAB formula
 f = 100_000
 n = 1
-min_delta = np.minimum(delta_1, delta_2)
-safe_phi = np.clip(phi, 0.05, None)
-L_total = (n * V_dc1 * V_dc2) / (2 * np.pi * f * input_power_W * min_delta * np.sin(safe_phi))
-L_total = np.abs(L_total) * 1e6 + np.random.normal(0, 0.05, num_samples)  # μH
+L_total = col['L_total_uH']
+denominator = np.multiply(input_power_W, 2 * np.pi * f, out=buf_a)
+denominator *= np.minimum(delta_1, delta_2, out=buf_b)
+denominator *= np.sin(np.clip(phi, 0.05, None, out=buf_b), out=buf_b)  # safe_phi
+np.multiply(V_dc1, n, out=L_total)
+L_total *= V_dc2
+L_total /= denominator
+np.abs(L_total, out=L_total)
+L_total *= 1e6  # μH
+L_total += L_noise
 
 # R_total (mΩ)
-R_total = (np.abs(V_dc1 - V_dc2) / (I_dc1 + I_dc2)) * 1000 + np.random.normal(0, 1, num_samples)
+R_total = col['R_total_mOhm']
+np.subtract(V_dc1, V_dc2, out=R_total)
+np.abs(R_total, out=R_total)
+R_total /= np.add(I_dc1, I_dc2, out=buf_a)
+R_total *= 1000
+R_total += R_noise
 
-# Efficiency (%)
-efficiency = (load_power_W / input_power_W) * 100
-efficiency += np.random.normal(0, 0.1, num_samples)  # minimal noise
-efficiency = np.clip(efficiency, 94, 98)  # physically plausible range
+# Efficiency (%), minimal noise, clipped to a physically plausible range
+efficiency = col['efficiency_percent']
+np.divide(load_power_W, input_power_W, out=efficiency)
+efficiency *= 100
+efficiency += eff_noise
+np.clip(efficiency, 94, 98, out=efficiency)
 
 # Temperature (°C) - rise proportional to power loss
-temperature = 40 + power_loss_W * 0.025 + np.random.normal(0, 0.5, num_samples)
-temperature = np.clip(temperature, 35, 65)
+temperature = col['temperature_C']
+np.multiply(power_loss_W, 0.025, out=temperature)
+temperature += 40
+temperature += temp_noise
+np.clip(temperature, 35, 65, out=temperature)
 
 # ZVS_status (based on logical criteria)
 ZVS_status = (temperature < 60) & (R_total < 45) & (L_total > 8.5)
 
 # Advanced loss formulas (optional, or use proxies)
-switching_loss_W = 0.03 * input_power_W + np.random.normal(0, 0.2, num_samples)
-conduction_loss_W = 0.01 * input_power_W + 0.05 * R_total + np.random.normal(0, 0.1, num_samples)
+switching_loss_W = col['switching_loss_W']
+np.multiply(input_power_W, 0.03, out=switching_loss_W)
+switching_loss_W += sw_noise
+conduction_loss_W = col['conduction_loss_W']
+np.multiply(input_power_W, 0.01, out=conduction_loss_W)
+conduction_loss_W += np.multiply(R_total, 0.05, out=buf_a)
+conduction_loss_W += cond_noise
+
+# Round every column in one pass (np.round's own scale/rint/unscale, per column)
+scale = 10.0 ** np.fromiter(COLUMNS.values(), dtype=np.int64)
+mat *= scale
+np.rint(mat, out=mat)
+mat /= scale
 
 # --- DataFrame ---
-data = pd.DataFrame({
-    'timestamp': timestamps,
-    'V_dc1': np.round(V_dc1, 2),
-    'V_dc2': np.round(V_dc2, 2),
-    'I_dc1': np.round(I_dc1, 2),
-    'I_dc2': np.round(I_dc2, 2),
-    'delta_1': np.round(delta_1, 3),
-    'delta_2': np.round(delta_2, 3),
-    'phi': np.round(phi, 3),
-    'L_total_uH': np.round(L_total, 3),
-    'R_total_mOhm': np.round(R_total, 2),
-    'efficiency_percent': np.round(efficiency, 2),
-    'temperature_C': np.round(temperature, 1),
-    'ZVS_status': ZVS_status,
-    'input_power_W': np.round(input_power_W, 2),
-    'load_power_W': np.round(load_power_W, 2),
-    'power_loss_W': np.round(power_loss_W, 3),
-    'switching_loss_W': np.round(switching_loss_W, 3),
-    'conduction_loss_W': np.round(conduction_loss_W, 3)
-})
+data = pd.DataFrame(mat, columns=list(COLUMNS))
+data.insert(0, 'timestamp', timestamps)
+data.insert(data.columns.get_loc('temperature_C') + 1, 'ZVS_status', ZVS_status)
 
+# CSV is what gets imported into the Google Sheet; Parquet is a compact local copy
 data.to_csv('data/dab_converter_historical_dataset.csv', index=False)
 print("Dataset saved to data/dab_converter_historical_dataset.csv")
+try:
+    data.to_parquet('data/dab_converter_historical_dataset.parquet', index=False, compression='zstd')
+    print("Dataset saved to data/dab_converter_historical_dataset.parquet")
+except ImportError:
+    print("pyarrow not installed; skipping Parquet output")
 print(data.head())